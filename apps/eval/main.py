@@ -5,13 +5,18 @@ Test the SMgenerator with various configurations and test cases.
 """
 
 import os
+import re
 import sys
 import time
 import json
+import hashlib
 import yaml
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, BinaryIO, Tuple
 
 # Add parent directories to path for imports
 ROOT_DIR = Path(__file__).parent.parent.parent
@@ -23,6 +28,70 @@ load_dotenv(ROOT_DIR / '.env')
 
 from brain import SMgenerator, SMResult
 
+# Prefer the libyaml C bindings when PyYAML was built with them
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Optional faster JSON encoder for streamed output
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_line(obj: Any) -> bytes:
+    """Encode obj as a single JSON Lines record."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str) + b'\n'
+    return (json.dumps(obj, default=str) + '\n').encode()
+
+
+# Expectation checkers: return None on pass, or a failure message
+def _check_state_name(result: SMResult, value: Any) -> Optional[str]:
+    got = result.state.get('name')
+    if got != value:
+        return f"Expected state: {value}, got: {got}"
+    return None
+
+
+def _check_message_contains(result: SMResult, value: str) -> Optional[str]:
+    if value not in result.message.lower():
+        return f"Expected message to contain: {value}"
+    return None
+
+
+def _check_tool_called(result: SMResult, value: Any) -> Optional[str]:
+    if not any(tc.get('name') == value for tc in result.tool_calls):
+        got = [tc.get('name') for tc in result.tool_calls]
+        return f"Expected tool: {value}, got: {got}"
+    return None
+
+
+def _lower(value: Any) -> str:
+    return str(value).lower()
+
+
+# Checked in this order as (key, checker, normalize); 'has_state' needs brain
+# access and is not checked yet
+_CHECKERS = (
+    ('state_name', _check_state_name, None),
+    # Matched case-insensitively; lowercase once here instead of per check
+    ('message_contains', _check_message_contains, _lower),
+    ('tool_called', _check_tool_called, None),
+)
+
+
+def compile_expectations(expected: Dict[str, Any]) -> list:
+    """Turn an expected dict into a list of (checker, value) pairs."""
+    checks = []
+    for key, checker, normalize in _CHECKERS:
+        if key in expected:
+            value = expected[key]
+            checks.append((checker, normalize(value) if normalize else value))
+    return checks
+
 
 @dataclass
 class TestCase:
@@ -31,6 +100,10 @@ class TestCase:
     input: str
     expected: Dict[str, Any] = field(default_factory=dict)
     description: str = ""
+    _checks: list = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._checks = compile_expectations(self.expected)
 
 
 @dataclass
@@ -49,55 +122,87 @@ def load_config(config_path: str = None) -> dict:
         config_path = Path(__file__).parent / 'config.yaml'
 
     with open(config_path) as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=_YamlLoader)
 
     # Expand environment variables
-    def expand_env(obj):
-        if isinstance(obj, str) and obj.startswith('${') and obj.endswith('}'):
-            env_var = obj[2:-1]
-            return os.environ.get(env_var, '')
-        elif isinstance(obj, dict):
-            return {k: expand_env(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [expand_env(item) for item in obj]
-        return obj
+    _expand_env_in_place(config)
+    return config
+
+
+_ENV_RE = re.compile(r'\$\{([A-Za-z_][A-Za-z0-9_]*)\}')
+
+
+def _expand_env_str(value: str) -> str:
+    """Replace every ${VAR} in value with its environment value ('' if unset)."""
+    return _ENV_RE.sub(lambda m: os.environ.get(m.group(1), ''), value)
 
-    return expand_env(config)
+
+def _expand_env_in_place(obj: Any) -> None:
+    """Expand ${VAR} references in all strings of a dict/list tree, in place."""
+    if isinstance(obj, dict):
+        items = obj.items()
+    elif isinstance(obj, list):
+        items = enumerate(obj)
+    else:
+        return
+
+    for key, value in items:
+        if isinstance(value, str):
+            if '${' in value:
+                obj[key] = _expand_env_str(value)
+        elif isinstance(value, (dict, list)):
+            _expand_env_in_place(value)
 
 
 def load_test_cases(suite_path: str) -> List[TestCase]:
-    """Load test cases from a YAML file."""
+    """Load test cases from a YAML file (parsed once per file version)."""
+    suite_path = str(suite_path)
+    return list(_load_test_cases_cached(suite_path, os.stat(suite_path).st_mtime_ns))
+
+
+@lru_cache(maxsize=None)
+def _load_test_cases_cached(suite_path: str, mtime_ns: int) -> tuple:
+    """Parse a suite file; keyed on mtime so edits are picked up."""
     with open(suite_path) as f:
-        data = yaml.safe_load(f)
+        data = yaml.load(f, Loader=_YamlLoader)
 
     cases = []
     for item in data:
         cases.append(TestCase(
             name=item.get('name', 'unnamed'),
             input=item.get('input', ''),
-            expected=item.get('expected', {}),
+            expected=item.get('expected') or {},
             description=item.get('description', '')
         ))
-    return cases
+    return tuple(cases)
 
 
 class EvalRunner:
     """Evaluation runner for testing the SMgenerator."""
 
-    def __init__(self, config: dict, verbose: bool = False):
+    def __init__(self, config: dict, verbose: bool = False, concurrency: int = None):
         """
         Initialize the evaluation runner.
 
         Args:
             config: Configuration dictionary
             verbose: Enable verbose output
+            concurrency: Number of test cases to run in parallel
+                (default: eval.concurrency from config, or 8)
         """
         self.config = config
         self.verbose = verbose
+        if concurrency is None:
+            concurrency = config.get('eval', {}).get('concurrency', 8)
+        self.concurrency = max(1, int(concurrency))
         self.results: List[Dict[str, Any]] = []
 
-    def create_smgen(self, variant: Dict[str, Any] = None) -> SMgenerator:
-        """Create an SMgenerator instance with optional variant overrides."""
+        # Idle SMgenerator instances, keyed by a hash of their effective config
+        self._smgen_cache: Dict[bytes, List[SMgenerator]] = {}
+        self._smgen_cache_lock = threading.Lock()
+
+    def _smgen_config(self, variant: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Effective SMgenerator config for a variant."""
         smgen_config = dict(self.config.get('brain', {}))
 
         # Apply variant overrides
@@ -108,53 +213,69 @@ class EvalRunner:
         smgen_config['anthropic_api_key'] = self.config.get('anthropic', {}).get('api_key', '')
         smgen_config['openai_api_key'] = self.config.get('openai', {}).get('api_key', '')
 
-        return SMgenerator(smgen_config)
+        return smgen_config
 
-    def check_expectations(self, result: SMResult, expected: Dict[str, Any]) -> bool:
-        """Check if result meets expectations."""
-        if not result.success:
-            return False
+    def create_smgen(self, variant: Dict[str, Any] = None) -> SMgenerator:
+        """Create an SMgenerator instance with optional variant overrides."""
+        return SMgenerator(self._smgen_config(variant))
 
-        # Check state name
-        if 'state_name' in expected:
-            if result.state.get('name') != expected['state_name']:
-                if self.verbose:
-                    print(f"    Expected state: {expected['state_name']}, got: {result.state.get('name')}")
-                return False
+    def acquire_smgen(self, variant: Dict[str, Any] = None) -> Tuple[bytes, SMgenerator]:
+        """
+        Check out an SMgenerator for a variant, reusing an idle instance
+        created for an identical brain config if one exists.
 
-        # Check that a state exists
-        if 'has_state' in expected:
-            state_name = expected['has_state']
-            # This would require access to the brain's state machine
-            # For now, just check if it's in the result
-            pass
+        Returns (key, smgen); hand both back with release_smgen.
+        """
+        smgen_config = self._smgen_config(variant)
+        key = hashlib.blake2b(
+            json.dumps(smgen_config, sort_keys=True, default=str).encode()
+        ).digest()
 
-        # Check message contains
-        if 'message_contains' in expected:
-            if expected['message_contains'].lower() not in result.message.lower():
-                if self.verbose:
-                    print(f"    Expected message to contain: {expected['message_contains']}")
-                return False
+        with self._smgen_cache_lock:
+            pool = self._smgen_cache.get(key)
+            if pool:
+                return key, pool.pop()
+
+        return key, SMgenerator(smgen_config)
+
+    def release_smgen(self, key: bytes, smgen: SMgenerator):
+        """Return an SMgenerator from acquire_smgen for later reuse."""
+        with self._smgen_cache_lock:
+            self._smgen_cache.setdefault(key, []).append(smgen)
+
+    def check_expectations(self, result: SMResult, expected: Dict[str, Any],
+                           checks: list = None) -> bool:
+        """
+        Check if result meets expectations.
 
-        # Check tool was called
-        if 'tool_called' in expected:
-            tool_names = [tc.get('name') for tc in result.tool_calls]
-            if expected['tool_called'] not in tool_names:
+        ``message_contains`` is expected to be lowercase already, as
+        produced by load_test_cases. Pass a TestCase's precompiled
+        ``checks`` to skip re-reading the expected dict.
+        """
+        if not result.success:
+            return False
+
+        if checks is None:
+            checks = compile_expectations(expected)
+
+        for checker, value in checks:
+            failure = checker(result, value)
+            if failure is not None:
                 if self.verbose:
-                    print(f"    Expected tool: {expected['tool_called']}, got: {tool_names}")
+                    print(f"    {failure}")
                 return False
 
         return True
 
     def run_case(self, smgen: SMgenerator, case: TestCase) -> TestResult:
         """Run a single test case."""
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
 
         try:
             result = smgen.process(case.input)
-            timing_ms = (time.time() - start_time) * 1000
+            timing_ms = (time.perf_counter_ns() - start_ns) / 1e6
 
-            passed = self.check_expectations(result, case.expected)
+            passed = self.check_expectations(result, case.expected, case._checks)
 
             return TestResult(
                 case=case,
@@ -164,7 +285,7 @@ class EvalRunner:
             )
 
         except Exception as e:
-            timing_ms = (time.time() - start_time) * 1000
+            timing_ms = (time.perf_counter_ns() - start_ns) / 1e6
             return TestResult(
                 case=case,
                 passed=False,
@@ -173,15 +294,24 @@ class EvalRunner:
                 timing_ms=timing_ms
             )
 
-    def run_suite(self, suite_name: str, variant: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Run a test suite with a specific variant."""
+    def run_suite(self, suite_name: str, variant: Dict[str, Any] = None,
+                  stream: Optional[BinaryIO] = None) -> Dict[str, Any]:
+        """
+        Run a test suite with a specific variant.
+
+        If ``stream`` is given, each case result is written to it as a JSON
+        line as soon as it is available and the returned summary omits the
+        per-case ``results`` list.
+        """
+        variant_name = variant.get('name', 'default') if variant else 'default'
+
         cases_dir = Path(__file__).parent / 'cases'
         suite_path = cases_dir / f'{suite_name}.yaml'
 
         if not suite_path.exists():
             return {
                 'suite': suite_name,
-                'variant': variant.get('name', 'default') if variant else 'default',
+                'variant': variant_name,
                 'error': f'Suite file not found: {suite_path}',
                 'passed': 0,
                 'failed': 0,
@@ -189,10 +319,18 @@ class EvalRunner:
             }
 
         cases = load_test_cases(suite_path)
-        smgen = self.create_smgen(variant)
 
-        results = []
-        for case in cases:
+        # SMgenerator is stateful, so each worker thread checks out its own instance
+        local = threading.local()
+        checked_out = []
+
+        def run_one(case: TestCase) -> TestResult:
+            smgen = getattr(local, 'smgen', None)
+            if smgen is None:
+                key, smgen = self.acquire_smgen(variant)
+                local.smgen = smgen
+                checked_out.append((key, smgen))
+
             # Reset SMgenerator between cases
             smgen.reset()
 
@@ -200,36 +338,54 @@ class EvalRunner:
                 print(f"  Running: {case.name}...")
 
             test_result = self.run_case(smgen, case)
-            results.append(test_result)
 
             if self.verbose:
                 status = '✓' if test_result.passed else '✗'
                 print(f"    {status} {case.name} ({test_result.timing_ms:.0f}ms)")
 
-        passed = sum(1 for r in results if r.passed)
-        failed = len(results) - passed
+            return test_result
 
-        return {
+        passed = 0
+        total = 0
+        case_results = []
+
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(cases) or 1)) as executor:
+                for r in executor.map(run_one, cases):
+                    total += 1
+                    if r.passed:
+                        passed += 1
+
+                    case_result = {
+                        'case': r.case.name,
+                        'passed': r.passed,
+                        'timing_ms': r.timing_ms,
+                        'error': r.error,
+                        'state': r.result.state if r.result else None,
+                        'message': r.result.message if r.result else None,
+                    }
+                    if stream is not None:
+                        stream.write(_json_line({'suite': suite_name, 'variant': variant_name, **case_result}))
+                    else:
+                        case_results.append(case_result)
+        finally:
+            for key, smgen in checked_out:
+                self.release_smgen(key, smgen)
+
+        summary = {
             'suite': suite_name,
-            'variant': variant.get('name', 'default') if variant else 'default',
+            'variant': variant_name,
             'passed': passed,
-            'failed': failed,
-            'total': len(results),
-            'results': [
-                {
-                    'case': r.case.name,
-                    'passed': r.passed,
-                    'timing_ms': r.timing_ms,
-                    'error': r.error,
-                    'state': r.result.state if r.result else None,
-                    'message': r.result.message if r.result else None,
-                }
-                for r in results
-            ]
+            'failed': total - passed,
+            'total': total,
         }
+        if stream is None:
+            summary['results'] = case_results
+        return summary
 
-    def run(self, suites: List[str] = None) -> List[Dict[str, Any]]:
-        """Run all configured test suites."""
+    def run(self, suites: List[str] = None,
+            stream: Optional[BinaryIO] = None) -> List[Dict[str, Any]]:
+        """Run all configured test suites (see run_suite for ``stream``)."""
         if suites is None:
             suites = self.config.get('eval', {}).get('suites', ['basic'])
 
@@ -245,7 +401,7 @@ class EvalRunner:
             for variant in variants:
                 print(f"\nVariant: {variant.get('name', 'default')}")
 
-                result = self.run_suite(suite, variant)
+                result = self.run_suite(suite, variant, stream=stream)
                 all_results.append(result)
 
                 status = '✓' if result['failed'] == 0 else '✗'
@@ -283,22 +439,31 @@ def main():
     parser.add_argument('--suite', '-s', action='append', help='Test suite to run (can specify multiple)')
     parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose output')
     parser.add_argument('--output', '-o', help='Output results to JSON file')
+    parser.add_argument('--output-format', choices=['json', 'jsonl'], default='json',
+                        help='json: one document at the end; jsonl: one line per case, streamed')
+    parser.add_argument('--concurrency', '-j', type=int, help='Number of test cases to run in parallel')
     args = parser.parse_args()
 
     config = load_config(args.config)
-    runner = EvalRunner(config, verbose=args.verbose)
+    runner = EvalRunner(config, verbose=args.verbose, concurrency=args.concurrency)
 
     print("=" * 60)
     print("AdaptLight Evaluation Runner")
     print("=" * 60)
 
-    results = runner.run(args.suite)
-    success = runner.print_summary(results)
-
-    if args.output:
-        with open(args.output, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+    if args.output and args.output_format == 'jsonl':
+        with open(args.output, 'wb') as f:
+            results = runner.run(args.suite, stream=f)
+        success = runner.print_summary(results)
         print(f"\nResults written to: {args.output}")
+    else:
+        results = runner.run(args.suite)
+        success = runner.print_summary(results)
+
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(results, f, indent=2, default=str)
+            print(f"\nResults written to: {args.output}")
 
     sys.exit(0 if success else 1)
 
@@ -25,6 +25,14 @@ except ImportError:
 class ButtonController:
     """Handles button input and detects different press patterns."""
 
+    # Fixed attribute set: faster attribute access, no per-instance __dict__
+    __slots__ = (
+        'DOUBLE_CLICK_THRESHOLD', 'HOLD_THRESHOLD', 'bounce_time', 'button',
+        'button_pin', 'click_count', 'click_timer', 'hold_fired', 'hold_timer',
+        'is_holding', 'on_double_click', 'on_hold', 'on_release', 'on_single_click',
+        'press_start_time'
+    )
+
     def __init__(self, button_pin=2, bounce_time=0.05):
         """
         Initialize button controller.
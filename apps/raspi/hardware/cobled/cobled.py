@@ -7,6 +7,7 @@ to protect the LEDs and power supply. Provides the same interface the
 rest of the app expects (set_color, animations, cleanup).
 """
 
+import math
 import time
 import threading
 
@@ -17,6 +18,8 @@ except ImportError:
     GPIO_AVAILABLE = False
     print("Warning: gpiozero not available. Running COB LED in simulation mode.")
 
+_sin = math.sin
+
 
 class SimulatedPWMLED:
     """Simulated PWM LED for development without hardware."""
@@ -175,12 +178,12 @@ class CobLed:
 
     def start_loading_animation(self, color=(255, 255, 255), speed=0.01, period=2.0, debug=False):
         """Soft breathing (sine) loading animation."""
-        import math
-
         self.stop_loading_animation()
         self.loading_active = True
 
         def loading_loop():
+            sin = _sin
+            two_pi = 2 * math.pi
             start = time.time()
             last_update = start
             update_count = 0
@@ -188,7 +191,7 @@ class CobLed:
                 loop_start = time.time()
                 elapsed = loop_start - start
                 phase = (elapsed % period) / period
-                brightness_factor = 0.4 + 0.6 * (math.sin(2 * math.pi * phase) + 1) / 2
+                brightness_factor = 0.4 + 0.6 * (sin(two_pi * phase) + 1) / 2
                 r = int(color[0] * brightness_factor)
                 g = int(color[1] * brightness_factor)
                 b = int(color[2] * brightness_factor)
@@ -211,16 +214,15 @@ class CobLed:
 
     def start_recording_animation(self, base_color=(0, 255, 0), speed=0.01, debug=False):
         """Breathing animation for recording state."""
-        import math
-
         self.stop_recording_animation()
         self.recording_active = True
 
         def recording_loop():
+            sin = _sin
             step = 0
             start = time.time()
             while self.recording_active:
-                brightness_factor = 0.2 + 0.8 * (math.sin(step * 0.1) + 1) / 2
+                brightness_factor = 0.2 + 0.8 * (sin(step * 0.1) + 1) / 2
                 r = int(base_color[0] * brightness_factor)
                 g = int(base_color[1] * brightness_factor)
                 b = int(base_color[2] * brightness_factor)
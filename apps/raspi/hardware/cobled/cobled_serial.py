@@ -14,9 +14,14 @@ Wiring:
   Pi GND -> Arduino GND
 """
 
+import math
+import os
+import select
 import time
 import threading
 
+import numpy as np
+
 # Try to import serial
 SERIAL_AVAILABLE = False
 try:
@@ -25,6 +30,15 @@ try:
 except ImportError:
     print("Warning: pyserial not available. Install with: pip install pyserial")
 
+# Recording animation follows sin(step * 0.1): one period in frames
+_RECORD_PERIOD_FRAMES = round(2 * math.pi / 0.1)
+
+
+def _breath_curve(n, low):
+    """Brightness factors in [low, 1.0] over one sine period of n frames."""
+    t = np.arange(n)
+    return low + (1.0 - low) * (np.sin(2 * np.pi * t / n) + 1) / 2
+
 
 class CobLedSerial:
     """COB RGB LED controller via serial to Arduino."""
@@ -46,12 +60,31 @@ class CobLedSerial:
         self.brightness = max(0.0, min(1.0, brightness))
         self.current_color = (0, 0, 0)
         self.serial = None
-
-        # Animation flags
-        self.loading_active = False
-        self.recording_active = False
-        self.loading_thread = None
-        self.recording_thread = None
+        self._fd = None
+
+        # Preallocated [SYNC, R, G, B] frame reused for synchronous writes
+        self._frame = bytearray([self.SYNC_BYTE, 0, 0, 0])
+        self._last_sent = None
+
+        # Background writer: callers overwrite a single preallocated pending
+        # frame (only the latest is kept) and the writer copies it into its
+        # own buffer, so the per-frame hot path allocates nothing
+        self._pending = bytearray([self.SYNC_BYTE, 0, 0, 0])
+        self._has_pending = False
+        self._pending_lock = threading.Lock()
+        self._tx_frame = bytearray(4)
+        self._tx_lock = threading.Lock()
+        self._tx_wake = threading.Event()
+        self._tx_shutdown = False
+        self._tx_thread = None
+
+        # Single animator thread; mode is None, 'loading' or 'recording'
+        self._anim_mode = None
+        self._anim_params = {}
+        self._anim_lock = threading.Lock()
+        self._anim_wake = threading.Event()
+        self._anim_shutdown = False
+        self._anim_thread = None
 
         if SERIAL_AVAILABLE:
             try:
@@ -67,6 +100,14 @@ class CobLedSerial:
                     rtscts=False,
                     dsrdtr=False
                 )
+                # Raw fd for hot-path writes that bypass pyserial's Python layer
+                self._fd = self.serial.fileno()
+
+                # Shorten driver-side buffering where the UART supports it
+                try:
+                    self.serial.set_low_latency_mode(True)
+                except (AttributeError, ValueError, OSError):
+                    pass
 
                 # Flush any stale data in buffers
                 self.serial.reset_input_buffer()
@@ -82,9 +123,12 @@ class CobLedSerial:
                 # Send warm-up commands to prime the connection
                 # This ensures Arduino is ready before user interaction
                 for _ in range(3):
-                    self._send_rgb(0, 0, 0)
+                    self._send_rgb(0, 0, 0, flush=True)
                     time.sleep(0.05)
 
+                self._tx_thread = threading.Thread(target=self._tx_loop, daemon=True)
+                self._tx_thread.start()
+
                 print(f"CobLedSerial initialized: {port} @ {baudrate} baud")
             except Exception as e:
                 print(f"Failed to open serial port {port}: {e}")
@@ -92,36 +136,122 @@ class CobLedSerial:
         else:
             print("CobLedSerial running in simulation mode (pyserial not available)")
 
-    def _send_rgb(self, r: int, g: int, b: int):
+        self._anim_thread = threading.Thread(target=self._animation_loop, daemon=True)
+        self._anim_thread.start()
+
+    def _send_rgb(self, r: int, g: int, b: int, flush: bool = False):
         """
         Send RGB values over serial.
 
         Args:
             r, g, b: RGB values (0-254)
+            flush: Write synchronously and block until the frame has drained
         """
         # Clamp values to valid range (0-254, reserve 255 for sync)
         r = max(0, min(self.MAX_VALUE, int(r)))
         g = max(0, min(self.MAX_VALUE, int(g)))
         b = max(0, min(self.MAX_VALUE, int(b)))
 
+        if flush:
+            self._write_now(r, g, b)
+        else:
+            self._enqueue(r, g, b)
+
+    def _enqueue(self, r: int, g: int, b: int):
+        """Hand a clamped frame to the writer thread (drops any unsent frame)."""
+        self._last_sent = (r, g, b)
+        if self._tx_thread is not None:
+            with self._pending_lock:
+                pending = self._pending
+                pending[1] = r
+                pending[2] = g
+                pending[3] = b
+                self._has_pending = True
+            self._tx_wake.set()
+        else:
+            # Simulation mode
+            print(f"CobLedSerial: RGB({r}, {g}, {b})")
+
+    def _enqueue_frame(self, frame: bytes):
+        """Hand a packed [SYNC, R, G, B] frame to the writer thread."""
+        self._last_sent = (frame[1], frame[2], frame[3])
+        if self._tx_thread is not None:
+            with self._pending_lock:
+                self._pending[:] = frame
+                self._has_pending = True
+            self._tx_wake.set()
+        else:
+            # Simulation mode
+            print(f"CobLedSerial: RGB({frame[1]}, {frame[2]}, {frame[3]})")
+
+    def _drop_pending(self):
+        """Discard an unsent frame that a synchronous write supersedes."""
+        with self._pending_lock:
+            self._has_pending = False
+
+    def _write_now(self, r: int, g: int, b: int):
+        """Write a clamped frame on the calling thread and drain it."""
+        self._last_sent = (r, g, b)
         if self.serial and self.serial.is_open:
-            try:
-                data = bytes([self.SYNC_BYTE, r, g, b])
-                self.serial.write(data)
-                self.serial.flush()  # Ensure data is sent immediately
-            except Exception as e:
-                print(f"Serial write error: {e}")
+            with self._tx_lock:
+                # Anything still queued is older than this frame
+                self._drop_pending()
+                try:
+                    frame = self._frame
+                    frame[1] = r
+                    frame[2] = g
+                    frame[3] = b
+                    self._write_fd(frame)
+                    self.serial.flush()
+                except Exception as e:
+                    self._last_sent = None
+                    print(f"Serial write error: {e}")
         else:
             # Simulation mode
             print(f"CobLedSerial: RGB({r}, {g}, {b})")
 
-    def set_color(self, r: int, g: int, b: int):
+    def _write_fd(self, data):
         """
-        Set COB LED color.
+        Write a whole buffer to the non-blocking serial fd.
 
-        Args:
-            r, g, b: RGB values (0-255)
+        os.write may accept only part of a frame or raise EAGAIN when the
+        driver buffer is full; a short write would break SYNC framing, so
+        keep going (waiting for POLLOUT) until every byte is out.
         """
+        fd = self._fd
+        view = memoryview(data)
+        while view:
+            try:
+                n = os.write(fd, view)
+            except BlockingIOError:
+                if not select.select((), (fd,), (), 1.0)[1]:
+                    raise OSError("serial write timed out")
+                continue
+            view = view[n:]
+
+    def _tx_loop(self):
+        """Writer thread: send the latest queued frame straight to the fd."""
+        frame = self._tx_frame
+        while True:
+            self._tx_wake.wait()
+            self._tx_wake.clear()
+            if self._tx_shutdown:
+                break
+            with self._tx_lock:
+                with self._pending_lock:
+                    if not self._has_pending:
+                        continue
+                    frame[:] = self._pending
+                    self._has_pending = False
+                try:
+                    self._write_fd(frame)
+                except OSError as e:
+                    # Forget the memoized frame so the next set_color retries
+                    self._last_sent = None
+                    print(f"Serial write error: {e}")
+
+    def _scale_color(self, r: int, g: int, b: int):
+        """Store the requested color and return it scaled for output (0-254)."""
         # Store original color
         self.current_color = (
             max(0, min(255, int(r))),
@@ -133,8 +263,52 @@ class CobLedSerial:
         r_out = int(self.current_color[0] * self.brightness * self.MAX_VALUE / 255)
         g_out = int(self.current_color[1] * self.brightness * self.MAX_VALUE / 255)
         b_out = int(self.current_color[2] * self.brightness * self.MAX_VALUE / 255)
+        return r_out, g_out, b_out
 
-        self._send_rgb(r_out, g_out, b_out)
+    def set_color(self, r: int, g: int, b: int, flush: bool = False):
+        """
+        Set COB LED color.
+
+        Args:
+            r, g, b: RGB values (0-255)
+            flush: Block until the frame has drained
+        """
+        out = self._scale_color(r, g, b)
+        # Nothing to send if the output bytes haven't changed
+        if not flush and out == self._last_sent:
+            return
+        self._send_rgb(*out, flush=flush)
+
+    def set_colors_bulk(self, colors, flush: bool = False):
+        """
+        Send a sequence of colors back-to-back in a single serial write.
+
+        Args:
+            colors: Sequence of (r, g, b) tuples (0-255), or an (N, 3) array
+            flush: Block until all frames have drained
+        """
+        rgb = np.asarray(colors, dtype=np.int64).reshape(-1, 3)
+        if not len(rgb):
+            return
+        data = self._pack_frames(rgb)
+
+        self.current_color = tuple(int(v) for v in np.clip(rgb[-1], 0, 255))
+        self._last_sent = (data[-3], data[-2], data[-1])
+
+        if self.serial and self.serial.is_open:
+            with self._tx_lock:
+                self._drop_pending()
+                try:
+                    # pyserial handles partial writes of the large buffer
+                    self.serial.write(data)
+                    if flush:
+                        self.serial.flush()
+                except Exception as e:
+                    self._last_sent = None
+                    print(f"Serial write error: {e}")
+        else:
+            # Simulation mode
+            print(f"CobLedSerial: {len(rgb)} frames, last RGB{self._last_sent}")
 
     def get_current_color(self):
         """Return the last requested RGB tuple."""
@@ -143,6 +317,10 @@ class CobLedSerial:
     def set_brightness(self, brightness: float):
         """Adjust global brightness and reapply current color."""
         self.brightness = max(0.0, min(1.0, brightness))
+        with self._anim_lock:
+            params = self._anim_params
+            if 'factors' in params:
+                params['frames'] = self._build_frames(params['color'], params['factors'])
         self.set_color(*self.current_color)
 
     def clear(self):
@@ -153,39 +331,98 @@ class CobLedSerial:
         """Turn off all LEDs (alias for clear)."""
         self.clear()
 
+    @property
+    def loading_active(self):
+        return self._anim_mode == 'loading'
+
+    @property
+    def recording_active(self):
+        return self._anim_mode == 'recording'
+
+    def _animation_loop(self):
+        """Persistent animator: renders a frame for the current mode, then waits."""
+        while not self._anim_shutdown:
+            with self._anim_lock:
+                mode = self._anim_mode
+                if mode == 'loading':
+                    delay = self._render_loading_frame(self._anim_params)
+                elif mode == 'recording':
+                    delay = self._render_recording_frame(self._anim_params)
+                else:
+                    delay = None
+            # Mode changes set the event, so they take effect immediately
+            self._anim_wake.wait(delay)
+            self._anim_wake.clear()
+
+    def _build_frames(self, color, factors):
+        """
+        Pack a breathing schedule into consecutive [SYNC, R, G, B] frames.
+
+        Applies the same int truncation, clamping and brightness scaling as
+        set_color, so frame i matches set_color(*(color * factors[i])).
+        """
+        return self._pack_frames((factors[:, None] * np.asarray(color, dtype=float)).astype(np.int64))
+
+    def _pack_frames(self, rgb):
+        """Clamp, brightness-scale and pack an (N, 3) array of 0-255 colors."""
+        out = (np.clip(rgb, 0, 255) * (self.brightness * self.MAX_VALUE / 255)).astype(np.uint8)
+        frames = np.empty((len(out), 4), dtype=np.uint8)
+        frames[:, 0] = self.SYNC_BYTE
+        frames[:, 1:] = out
+        return frames.tobytes()
+
+    def _send_schedule_frame(self, params, i):
+        """Queue frame i of the current schedule, skipping repeats."""
+        offset = i * 4
+        frame = params['frames'][offset:offset + 4]
+        if frame != params['last']:
+            params['last'] = frame
+            self._enqueue_frame(frame)
+
+    def _render_loading_frame(self, params):
+        elapsed = time.time() - params['start']
+        self._send_schedule_frame(params, int(elapsed / params['speed']) % params['count'])
+        return params['speed']
+
+    def _render_recording_frame(self, params):
+        self._send_schedule_frame(params, params['step'] % params['count'])
+        params['step'] += 1
+        return params['speed']
+
+    def _schedule_params(self, color, speed, factors, **extra):
+        params = {
+            'color': color,
+            'speed': speed,
+            'factors': factors,
+            'count': len(factors),
+            'frames': self._build_frames(color, factors),
+            'last': None,
+        }
+        params.update(extra)
+        return params
+
+    def _set_animation(self, mode, params=None):
+        """Switch the animator mode; returns once no frame of the old mode is in flight."""
+        with self._anim_lock:
+            self._anim_mode = mode
+            self._anim_params = params or {}
+        self._anim_wake.set()
+
+    def _stop_animation(self, mode):
+        if self._anim_mode == mode:
+            self._set_animation(None)
+
     def _stop_loading_animation(self):
-        self.loading_active = False
-        if self.loading_thread and self.loading_thread.is_alive():
-            self.loading_thread.join(timeout=0.5)
-        self.loading_thread = None
+        self._stop_animation('loading')
 
     def _stop_recording_animation(self):
-        self.recording_active = False
-        if self.recording_thread and self.recording_thread.is_alive():
-            self.recording_thread.join(timeout=0.5)
-        self.recording_thread = None
+        self._stop_animation('recording')
 
     def start_loading_animation(self, color=(255, 255, 255), speed=0.01, period=2.0):
         """Soft breathing (sine) loading animation."""
-        import math
-
-        self.stop_loading_animation()
-        self.loading_active = True
-
-        def loading_loop():
-            start = time.time()
-            while self.loading_active:
-                elapsed = time.time() - start
-                phase = (elapsed % period) / period
-                brightness_factor = 0.4 + 0.6 * (math.sin(2 * math.pi * phase) + 1) / 2
-                r = int(color[0] * brightness_factor)
-                g = int(color[1] * brightness_factor)
-                b = int(color[2] * brightness_factor)
-                self.set_color(r, g, b)
-                time.sleep(speed)
-
-        self.loading_thread = threading.Thread(target=loading_loop, daemon=True)
-        self.loading_thread.start()
+        factors = _breath_curve(max(1, round(period / speed)), 0.4)
+        self._set_animation('loading', self._schedule_params(
+            color, speed, factors, start=time.time()))
 
     def stop_loading_animation(self):
         """Stop loading animation."""
@@ -194,24 +431,9 @@ class CobLedSerial:
 
     def start_recording_animation(self, base_color=(0, 255, 0), speed=0.01):
         """Breathing animation for recording state."""
-        import math
-
-        self.stop_recording_animation()
-        self.recording_active = True
-
-        def recording_loop():
-            step = 0
-            while self.recording_active:
-                brightness_factor = 0.2 + 0.8 * (math.sin(step * 0.1) + 1) / 2
-                r = int(base_color[0] * brightness_factor)
-                g = int(base_color[1] * brightness_factor)
-                b = int(base_color[2] * brightness_factor)
-                self.set_color(r, g, b)
-                step += 1
-                time.sleep(speed)
-
-        self.recording_thread = threading.Thread(target=recording_loop, daemon=True)
-        self.recording_thread.start()
+        factors = _breath_curve(_RECORD_PERIOD_FRAMES, 0.2)
+        self._set_animation('recording', self._schedule_params(
+            base_color, speed, factors, step=0))
 
     def stop_recording_animation(self):
         """Stop recording animation."""
@@ -221,24 +443,32 @@ class CobLedSerial:
     def flash_success(self, flashes=3, duration=0.2):
         """Flash green to indicate success."""
         for _ in range(flashes):
-            self.set_color(0, 255, 0)
+            self.set_color(0, 255, 0, flush=True)
             time.sleep(duration)
-            self.clear()
+            self.set_color(0, 0, 0, flush=True)
             time.sleep(duration)
 
     def flash_error(self, flashes=3, duration=0.3):
         """Flash red to indicate error."""
         for _ in range(flashes):
-            self.set_color(255, 0, 0)
+            self.set_color(255, 0, 0, flush=True)
             time.sleep(duration)
-            self.clear()
+            self.set_color(0, 0, 0, flush=True)
             time.sleep(duration)
 
     def cleanup(self):
         """Cleanup resources."""
-        self._stop_loading_animation()
-        self._stop_recording_animation()
-        self.clear()
+        self._set_animation(None)
+        self._anim_shutdown = True
+        self._anim_wake.set()
+        if self._anim_thread and self._anim_thread.is_alive():
+            self._anim_thread.join(timeout=0.5)
+        self._tx_shutdown = True
+        self._tx_wake.set()
+        if self._tx_thread and self._tx_thread.is_alive():
+            self._tx_thread.join(timeout=0.5)
+        self._tx_thread = None
+        self.set_color(0, 0, 0, flush=True)
         if self.serial and self.serial.is_open:
             self.serial.close()
         print("CobLedSerial cleanup complete")
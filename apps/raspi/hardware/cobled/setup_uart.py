@@ -13,11 +13,23 @@ Usage:
 """
 
 import argparse
+import glob
 import os
+import re
 import subprocess
 import sys
+import termios
 import time
 
+SERIAL_PORT = "/dev/ttyAMA0"
+
+# Baud rate constant (termios.B*) -> integer speed
+_BAUD_RATES = {
+    getattr(termios, f"B{rate}"): rate
+    for rate in (9600, 19200, 38400, 57600, 115200, 230400, 460800, 921600)
+    if hasattr(termios, f"B{rate}")
+}
+
 
 def run_cmd(cmd, shell=True):
     """Run a command and return output."""
@@ -28,6 +40,58 @@ def run_cmd(cmd, shell=True):
         return "", str(e), 1
 
 
+def read_text(path):
+    """Read a text file, returning '' if it can't be read."""
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return ""
+
+
+def list_devices(patterns):
+    """Describe device nodes matching glob patterns (symlinks show their target)."""
+    lines = []
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)):
+            if os.path.islink(path):
+                lines.append(f"{path} -> {os.readlink(path)}")
+            else:
+                lines.append(path)
+    return lines
+
+
+def processes_using(device):
+    """Return (pid, cmdline) for processes holding device open, via /proc."""
+    users = []
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        try:
+            fds = os.scandir(f"/proc/{entry.name}/fd")
+        except OSError:
+            continue
+        with fds:
+            for fd in fds:
+                try:
+                    if os.readlink(fd.path) == device:
+                        cmdline = read_text(f"/proc/{entry.name}/cmdline").replace("\0", " ").strip()
+                        users.append((int(entry.name), cmdline))
+                        break
+                except OSError:
+                    continue
+    return users
+
+
+def get_serial_attrs(device):
+    """Return termios attributes for device (raises OSError)."""
+    fd = os.open(device, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+    try:
+        return termios.tcgetattr(fd)
+    finally:
+        os.close(fd)
+
+
 def check_uart_config():
     """Check UART configuration on the Pi."""
     print("=" * 60)
@@ -35,8 +99,8 @@ def check_uart_config():
     print("=" * 60)
 
     # Check if running on a Pi
-    stdout, _, _ = run_cmd("cat /proc/cpuinfo | grep 'Model'")
-    print(f"\nDevice: {stdout or 'Unknown'}")
+    model = re.findall(r"^Model.*$", read_text("/proc/cpuinfo"), re.M)
+    print(f"\nDevice: {model[0] if model else 'Unknown'}")
 
     # Check /boot/config.txt for UART settings
     print("\n--- /boot/config.txt UART settings ---")
@@ -48,8 +112,8 @@ def check_uart_config():
             break
 
     if config_file:
-        stdout, _, _ = run_cmd(f"grep -E '(uart|serial)' {config_file} || echo 'No UART settings found'")
-        print(stdout)
+        matches = re.findall(r"^.*(?:uart|serial).*$", read_text(config_file), re.M)
+        print("\n".join(matches) or "No UART settings found")
     else:
         print("Config file not found")
 
@@ -58,43 +122,37 @@ def check_uart_config():
     cmdline_paths = ["/boot/cmdline.txt", "/boot/firmware/cmdline.txt"]
     for path in cmdline_paths:
         if os.path.exists(path):
-            stdout, _, _ = run_cmd(f"cat {path}")
-            if "console=serial" in stdout or "console=ttyAMA" in stdout or "console=ttyS" in stdout:
+            cmdline = read_text(path).strip()
+            if "console=serial" in cmdline or "console=ttyAMA" in cmdline or "console=ttyS" in cmdline:
                 print(f"WARNING: Serial console is ENABLED in {path}")
                 print("This will interfere with UART communication!")
-                print(stdout)
+                print(cmdline)
             else:
                 print(f"OK: No serial console in {path}")
             break
 
     # Check serial port symlink
     print("\n--- Serial port symlinks ---")
-    stdout, _, _ = run_cmd("ls -la /dev/serial* 2>/dev/null || echo 'No serial ports found'")
-    print(stdout)
+    print("\n".join(list_devices(["/dev/serial*"])) or "No serial ports found")
 
     # Check if serial ports exist
     print("\n--- Available serial devices ---")
-    stdout, _, _ = run_cmd("ls -la /dev/ttyAMA* /dev/ttyS* /dev/ttyUSB* 2>/dev/null || echo 'None found'")
-    print(stdout)
+    print("\n".join(list_devices(["/dev/ttyAMA*", "/dev/ttyS*", "/dev/ttyUSB*"])) or "None found")
 
     # Check current serial port settings
-    print("\n--- Current /dev/ttyAMA0 settings ---")
-    stdout, stderr, rc = run_cmd("stty -F /dev/ttyAMA0 -a 2>&1")
-    if rc == 0:
-        # Parse out the important settings
-        lines = stdout.split('\n')
-        for line in lines:
-            if 'speed' in line or 'baud' in line:
-                print(line)
+    print(f"\n--- Current {SERIAL_PORT} settings ---")
+    try:
+        iflag, oflag, _, lflag, ispeed, ospeed, _ = get_serial_attrs(SERIAL_PORT)
+        print(f"speed {_BAUD_RATES.get(ospeed, ospeed)} baud")
         # Check for problematic settings
-        if 'icrnl' in stdout and '-icrnl' not in stdout:
+        if iflag & termios.ICRNL:
             print("WARNING: icrnl is ON (converts CR to NL) - will corrupt binary data")
-        if 'opost' in stdout and '-opost' not in stdout:
+        if oflag & termios.OPOST:
             print("WARNING: opost is ON (output processing) - will corrupt binary data")
-        if 'echo' in stdout and '-echo' not in stdout.replace('-echoe', '').replace('-echok', ''):
+        if lflag & termios.ECHO:
             print("WARNING: echo may be ON")
-    else:
-        print(f"Error: {stderr}")
+    except (OSError, termios.error) as e:
+        print(f"Error: {e}")
 
     # Check GPIO pin functions
     print("\n--- GPIO 14/15 pin configuration ---")
@@ -107,8 +165,12 @@ def check_uart_config():
     print("\n--- Services using serial port ---")
     stdout, _, _ = run_cmd("systemctl list-units --type=service | grep -i serial || echo 'No serial services found'")
     print(stdout)
-    stdout, _, _ = run_cmd("lsof /dev/ttyAMA0 2>/dev/null || echo 'No processes using /dev/ttyAMA0'")
-    print(stdout)
+    users = processes_using(SERIAL_PORT)
+    if users:
+        for pid, cmdline in users:
+            print(f"{pid}: {cmdline}")
+    else:
+        print(f"No processes using {SERIAL_PORT}")
 
     print("\n" + "=" * 60)
     print("Recommended Steps if UART isn't working:")
@@ -138,21 +200,40 @@ def check_uart_config():
 
 def configure_serial_raw():
     """Configure serial port for raw binary communication."""
-    print("\nConfiguring /dev/ttyAMA0 for raw binary mode...")
+    print(f"\nConfiguring {SERIAL_PORT} for raw binary mode...")
 
-    # Set raw mode with correct settings
-    cmd = "stty -F /dev/ttyAMA0 115200 cs8 -cstopb -parenb raw -echo -echoe -echok -echoctl -echonl -icanon -iexten -isig -brkint -icrnl -inpck -istrip -ixon -ixoff -opost -onlcr"
-    stdout, stderr, rc = run_cmd(cmd)
+    # Equivalent of: stty 115200 cs8 -cstopb -parenb raw -echo ... -opost -onlcr
+    try:
+        fd = os.open(SERIAL_PORT, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+    except OSError as e:
+        print(f"ERROR: {e}")
+        return False
 
-    if rc == 0:
-        print("OK: Serial port configured for 115200 baud, raw binary mode")
-    else:
-        print(f"ERROR: {stderr}")
+    try:
+        attrs = termios.tcgetattr(fd)
+        attrs[0] &= ~(termios.IGNBRK | termios.BRKINT | termios.PARMRK | termios.ISTRIP
+                      | termios.INLCR | termios.IGNCR | termios.ICRNL | termios.INPCK
+                      | termios.IXON | termios.IXOFF)
+        attrs[1] &= ~(termios.OPOST | termios.ONLCR)
+        attrs[2] &= ~(termios.CSIZE | termios.PARENB | termios.CSTOPB)
+        attrs[2] |= termios.CS8 | termios.CREAD | termios.CLOCAL
+        attrs[3] &= ~(termios.ECHO | termios.ECHOE | termios.ECHOK | termios.ECHONL
+                      | termios.ECHOCTL | termios.ICANON | termios.IEXTEN | termios.ISIG)
+        attrs[4] = attrs[5] = termios.B115200
+        attrs[6][termios.VMIN] = 1
+        attrs[6][termios.VTIME] = 0
+        termios.tcsetattr(fd, termios.TCSANOW, attrs)
+
+        # Verify settings
+        speed = termios.tcgetattr(fd)[5]
+    except termios.error as e:
+        print(f"ERROR: {e}")
         return False
+    finally:
+        os.close(fd)
 
-    # Verify settings
-    stdout, _, _ = run_cmd("stty -F /dev/ttyAMA0 speed")
-    print(f"Verified baud rate: {stdout}")
+    print("OK: Serial port configured for 115200 baud, raw binary mode")
+    print(f"Verified baud rate: {_BAUD_RATES.get(speed, speed)}")
 
     return True
 
@@ -18,31 +18,60 @@ import sys
 import time
 from pathlib import Path
 
+import numpy as np
+
 # Add parent directories to path
 ROOT_DIR = Path(__file__).parent.parent.parent.parent
 if (ROOT_DIR / 'apps').exists():
     ROOT_DIR = ROOT_DIR.parent
 sys.path.insert(0, str(ROOT_DIR))
 
+try:
+    from raspi.hardware.cobled.cobled_serial import CobLedSerial
+except ImportError:
+    from apps.raspi.hardware.cobled.cobled_serial import CobLedSerial
 
-def get_cobled_serial():
-    """Import CobLedSerial from the right location."""
-    try:
-        from raspi.hardware.cobled.cobled_serial import CobLedSerial
-    except ImportError:
-        from apps.raspi.hardware.cobled.cobled_serial import CobLedSerial
-    return CobLedSerial
+# pytest is only needed when collected as a test module; main() runs without it
+try:
+    import pytest
+except ImportError:
+    pytest = None
+
+
+def wheel_table():
+    """Generate rainbow colors for all 256 wheel positions as a (256, 3) uint8 array."""
+    pos = np.arange(256)
+    seg = np.minimum(pos // 85, 2)  # 0: green->red, 1: red->blue, 2: blue->green
+    up = (pos - seg * 85) * 3
+    down = 255 - up
+
+    table = np.zeros((256, 3), dtype=np.uint8)
+    for s, (rise, fall) in enumerate(((0, 1), (2, 0), (1, 2))):
+        mask = seg == s
+        table[mask, rise] = up[mask]
+        table[mask, fall] = down[mask]
+    return table
+
+
+# Packed RGB triples for every wheel position: WHEEL[3*pos:3*pos+3]
+WHEEL = wheel_table().tobytes()
 
 
-def test_basic_colors():
+if pytest is not None:
+    @pytest.fixture(scope="module")
+    def led():
+        """One controller (and one open port) shared by every test in the module."""
+        controller = CobLedSerial()
+        yield controller
+        controller.cleanup()
+
+
+def test_basic_colors(led):
     """Test basic color output."""
     print("\n" + "=" * 50)
     print("Test 1: Basic Colors")
     print("=" * 50)
 
-    CobLedSerial = get_cobled_serial()
-    led = CobLedSerial()
-
     colors = [
         ("Red", 255, 0, 0),
         ("Green", 0, 255, 0),
@@ -60,19 +89,15 @@ def test_basic_colors():
         led.set_color(r, g, b)
         time.sleep(0.5)
 
-    led.cleanup()
     print("  [OK] Basic colors test complete")
 
 
-def test_brightness():
+def test_brightness(led):
     """Test brightness control."""
     print("\n" + "=" * 50)
     print("Test 2: Brightness Control")
     print("=" * 50)
 
-    CobLedSerial = get_cobled_serial()
-    led = CobLedSerial()
-
     led.set_color(255, 255, 255)
 
     for brightness in [0.1, 0.25, 0.5, 0.75, 1.0]:
@@ -80,19 +105,15 @@ def test_brightness():
         led.set_brightness(brightness)
         time.sleep(0.5)
 
-    led.cleanup()
     print("  [OK] Brightness test complete")
 
 
-def test_smooth_fade():
+def test_smooth_fade(led):
     """Test smooth color fading."""
     print("\n" + "=" * 50)
     print("Test 3: Smooth Fade")
     print("=" * 50)
 
-    CobLedSerial = get_cobled_serial()
-    led = CobLedSerial()
-
     print("  Fading red...")
     for i in range(0, 255, 5):
         led.set_color(i, 0, 0)
@@ -117,69 +138,53 @@ def test_smooth_fade():
         led.set_color(0, 0, i)
         time.sleep(0.02)
 
-    led.cleanup()
     print("  [OK] Smooth fade test complete")
 
 
-def test_rainbow():
+def test_rainbow(led):
     """Test rainbow color cycle."""
     print("\n" + "=" * 50)
     print("Test 4: Rainbow Cycle")
     print("=" * 50)
 
-    CobLedSerial = get_cobled_serial()
-    led = CobLedSerial()
-
-    def wheel(pos):
-        """Generate rainbow colors across 0-255 positions."""
-        if pos < 85:
-            return (pos * 3, 255 - pos * 3, 0)
-        elif pos < 170:
-            pos -= 85
-            return (255 - pos * 3, 0, pos * 3)
-        else:
-            pos -= 170
-            return (0, pos * 3, 255 - pos * 3)
-
     print("  Running rainbow cycle (5 seconds)...")
-    start = time.time()
-    while time.time() - start < 5:
-        pos = int((time.time() - start) * 50) % 256
-        r, g, b = wheel(pos)
+    # Fixed 50 Hz cadence: sleep until the next tick rather than a flat 20 ms,
+    # so time spent in set_color does not accumulate as drift
+    interval = 0.02
+    start = next_tick = time.monotonic()
+    deadline = start + 5
+    frame = 0
+    while next_tick < deadline:
+        pos = frame & 0xFF
+        r, g, b = WHEEL[3 * pos:3 * pos + 3]
         led.set_color(r, g, b)
-        time.sleep(0.02)
+        frame += 1
+        next_tick = start + frame * interval
+        time.sleep(max(0.0, next_tick - time.monotonic()))
 
-    led.cleanup()
     print("  [OK] Rainbow cycle complete")
 
 
-def test_loading_animation():
+def test_loading_animation(led):
     """Test loading animation."""
     print("\n" + "=" * 50)
     print("Test 5: Loading Animation")
     print("=" * 50)
 
-    CobLedSerial = get_cobled_serial()
-    led = CobLedSerial()
-
     print("  Running loading animation (5 seconds)...")
     led.start_loading_animation()
     time.sleep(5)
     led.stop_loading_animation()
 
-    led.cleanup()
     print("  [OK] Loading animation complete")
 
 
-def test_flash():
+def test_flash(led):
     """Test flash patterns."""
     print("\n" + "=" * 50)
     print("Test 6: Flash Patterns")
     print("=" * 50)
 
-    CobLedSerial = get_cobled_serial()
-    led = CobLedSerial()
-
     print("  Flashing success (green)...")
     led.flash_success()
 
@@ -188,33 +193,40 @@ def test_flash():
     print("  Flashing error (red)...")
     led.flash_error()
 
-    led.cleanup()
     print("  [OK] Flash patterns complete")
 
 
-def test_speed():
+def test_speed(led):
     """Test update speed."""
     print("\n" + "=" * 50)
     print("Test 7: Update Speed")
     print("=" * 50)
 
-    CobLedSerial = get_cobled_serial()
-    led = CobLedSerial()
-
     updates = 1000
-    print(f"  Sending {updates} updates...")
 
+    # Per-update latency: each set_color is written and drained before the next
+    print(f"  Sending {updates} individual updates...")
     start = time.time()
     for i in range(updates):
-        led.set_color(i % 256, (i * 2) % 256, (i * 3) % 256)
+        led.set_color(i % 256, (i * 2) % 256, (i * 3) % 256, flush=True)
     elapsed = time.time() - start
 
-    ups = updates / elapsed
     print(f"  Time: {elapsed:.2f}s")
-    print(f"  Updates per second: {ups:.0f}")
+    print(f"  Updates per second: {updates / elapsed:.0f}")
     print(f"  Average latency: {elapsed / updates * 1000:.2f}ms")
 
-    led.cleanup()
+    # Bulk throughput: the same stream packed into one write
+    print(f"  Sending {updates} updates in one bulk write...")
+    i = np.arange(updates)
+    frames = (i[:, None] * np.array([1, 2, 3])) & 0xFF
+
+    start = time.time()
+    led.set_colors_bulk(frames, flush=True)
+    elapsed = time.time() - start
+
+    print(f"  Time: {elapsed:.2f}s")
+    print(f"  Bulk throughput: {updates / elapsed:.0f} frames/s")
+
     print("  [OK] Speed test complete")
 
 
@@ -244,14 +256,20 @@ def main():
         "speed": test_speed,
     }
 
-    if args.test == "all":
-        for name, test_func in tests.items():
-            try:
-                test_func()
-            except Exception as e:
-                print(f"  [FAIL] {name}: {e}")
-    else:
-        tests[args.test]()
+    # One controller (and one open port) shared by every test
+    led = CobLedSerial(port=args.port)
+    try:
+        if args.test == "all":
+            for name, test_func in tests.items():
+                try:
+                    test_func(led)
+                except Exception as e:
+                    print(f"  [FAIL] {name}: {e}")
+                led.clear()
+        else:
+            tests[args.test](led)
+    finally:
+        led.cleanup()
 
     print("\n" + "=" * 50)
     print("Tests complete!")
@@ -11,6 +11,13 @@ Key functions:
 - clear(): Turn off all LEDs
 """
 
+import asyncio
+import math
+import threading
+from concurrent.futures import CancelledError
+
+import numpy as np
+
 # Try neopixel_spi library (Pi 5 compatible via SPI)
 USE_NEOPIXEL_SPI = False
 
@@ -23,9 +30,60 @@ except ImportError:
     print("Install with: pip install adafruit-circuitpython-neopixel-spi adafruit-blinka")
 
 
+# Recording breath follows sin(step * 0.1), which repeats every ~63 steps
+_RECORD_PERIOD = int(round(2 * math.pi / 0.1))
+
+# Saturating 0-255 lookup table, indexed by value + 256 for values in [-256, 512)
+_CLAMP = bytes([0] * 256 + list(range(256)) + [255] * 256)
+
+
+def _clamp_rgb(r, g, b):
+    """Clamp an RGB triple to 0-255 integers."""
+    r, g, b = int(r), int(g), int(b)
+    if -256 <= r < 512 and -256 <= g < 512 and -256 <= b < 512:
+        return _CLAMP[r + 256], _CLAMP[g + 256], _CLAMP[b + 256]
+    return max(0, min(255, r)), max(0, min(255, g)), max(0, min(255, b))
+
+
+# Shared event loop (one daemon thread) that runs all LED animation coroutines
+_animation_loop = None
+_animation_loop_lock = threading.Lock()
+
+
+def _get_animation_loop():
+    """Return the shared animation event loop, starting it on first use."""
+    global _animation_loop
+    with _animation_loop_lock:
+        if _animation_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="led-animations", daemon=True).start()
+            _animation_loop = loop
+    return _animation_loop
+
+
+def _cancel_animation(future):
+    """Cancel an animation scheduled on the shared loop and wait for it to unwind."""
+    future.cancel()
+    # Round-trip through the loop: once this returns, the task has seen its
+    # CancelledError and can no longer draw a frame
+    try:
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), _get_animation_loop()).result(timeout=0.5)
+    except Exception:
+        pass
+
+
 class LEDController:
     """Controls NeoPixel LED strip for visual output."""
 
+    # Fixed attribute set: faster attribute access, no per-instance __dict__
+    __slots__ = (
+        'brightness', 'current_color', 'flash_task', 'led_count', 'loading_active',
+        'loading_task', 'pixels', 'recording_active', 'recording_task',
+        'set_brightness', 'set_color', 'set_pixel', 'show', 'use_spi', '_dirty',
+        '_frame', '_intensity', '_pixels_lock', '_scratch', '_tx_frame', '_tx_lock',
+        '_tx_pending', '_tx_shutdown', '_tx_thread', '_tx_wake'
+    )
+
     def __init__(self, led_count=16, led_pin=18, brightness=0.3, spi_bus_id=1):
         """
         Initialize LED controller.
@@ -40,6 +98,33 @@ class LEDController:
         self.brightness = brightness
         self.current_color = (0, 0, 0)
         self.pixels = None
+        self.loading_active = False
+        self.loading_task = None
+        self.recording_active = False
+        self.recording_task = None
+        self.flash_task = None
+
+        # False only while the strip is known to be all black, so clear()
+        # can skip a redundant SPI transfer. Unknown at startup
+        self._dirty = True
+
+        # Reusable full-strip RGB frame for animations
+        self._frame = np.zeros((led_count, 3), dtype=np.uint8)
+        self._scratch = np.zeros((led_count, 3), dtype=np.float64)
+        self._intensity = np.zeros(led_count, dtype=np.float64)
+
+        # Frame writer: _write_frame copies into a single pending buffer and
+        # wakes a background thread; the writer snapshots it into the pixel
+        # rows under _tx_lock, so the caller can prepare the next frame while
+        # the previous one is sent over SPI. Only the newest frame is kept.
+        # _pixels_lock serializes all access to the strip itself.
+        self._tx_frame = np.zeros((led_count, 3), dtype=np.uint8)
+        self._tx_pending = False
+        self._tx_lock = threading.Lock()
+        self._tx_wake = threading.Event()
+        self._tx_shutdown = False
+        self._tx_thread = None
+        self._pixels_lock = threading.Lock()
 
         if USE_NEOPIXEL_SPI:
             # Use neopixel_spi library (Pi 5 compatible via SPI)
@@ -68,7 +153,24 @@ class LEDController:
         else:
             print(f"LED simulation mode: {led_count} LEDs")
 
-    def set_color(self, r: int, g: int, b: int):
+        # Backend is fixed for the controller's lifetime, so bind the hot
+        # methods to their backend-specific versions once instead of
+        # re-checking pixels/USE_NEOPIXEL_SPI on every call
+        self.use_spi = USE_NEOPIXEL_SPI and self.pixels is not None
+        if self.use_spi:
+            self._tx_thread = threading.Thread(target=self._tx_loop, name="led-writer", daemon=True)
+            self._tx_thread.start()
+            self.set_color = self._set_color_spi
+            self.set_brightness = self._set_brightness_spi
+            self.set_pixel = self._set_pixel_spi
+            self.show = self.pixels.show
+        else:
+            self.set_color = self._set_color_sim
+            self.set_brightness = self._set_brightness_sim
+            self.set_pixel = self._set_pixel_sim
+            self.show = self._show_sim
+
+    def _set_color_spi(self, r: int, g: int, b: int):
         """
         Set all LEDs to a specific RGB color.
 
@@ -78,22 +180,26 @@ class LEDController:
             b: Blue value (0-255)
         """
         # Clamp values to 0-255
-        r = max(0, min(255, int(r)))
-        g = max(0, min(255, int(g)))
-        b = max(0, min(255, int(b)))
+        r, g, b = _clamp_rgb(r, g, b)
 
         self.current_color = (r, g, b)
 
-        if self.pixels:
-            if USE_NEOPIXEL_SPI:
-                # neopixel_spi uses fill and show like standard neopixel
-                self.pixels.fill((r, g, b))
-                self.pixels.show()
-        else:
-            # Simulation mode
-            print(f"LED Color: RGB({r}, {g}, {b})")
+        # neopixel_spi uses fill and show like standard neopixel. Any frame
+        # still queued for the writer is older than this color, so drop it
+        with self._pixels_lock:
+            self._drop_pending_frame()
+            self.pixels.fill((r, g, b))
+            self.pixels.show()
+            self._dirty = (r, g, b) != (0, 0, 0)
+
+    def _set_color_sim(self, r: int, g: int, b: int):
+        """Simulation mode version of set_color."""
+        r, g, b = _clamp_rgb(r, g, b)
 
-    def set_brightness(self, brightness: float):
+        self.current_color = (r, g, b)
+        print(f"LED Color: RGB({r}, {g}, {b})")
+
+    def _set_brightness_spi(self, brightness: float):
         """
         Set overall brightness.
 
@@ -102,13 +208,15 @@ class LEDController:
         """
         brightness = max(0.0, min(1.0, brightness))
         self.brightness = brightness
+        with self._pixels_lock:
+            self.pixels.brightness = brightness
+            self.pixels.show()
 
-        if self.pixels:
-            if USE_NEOPIXEL_SPI:
-                self.pixels.brightness = brightness
-                self.pixels.show()
-        else:
-            print(f"LED Brightness: {brightness * 100}%")
+    def _set_brightness_sim(self, brightness: float):
+        """Simulation mode version of set_brightness."""
+        brightness = max(0.0, min(1.0, brightness))
+        self.brightness = brightness
+        print(f"LED Brightness: {brightness * 100}%")
 
     def fill(self, color: tuple):
         """
@@ -121,6 +229,9 @@ class LEDController:
 
     def clear(self):
         """Turn off all LEDs."""
+        # Already black: skip the fill and SPI transfer
+        if self.use_spi and not self._dirty:
+            return
         self.set_color(0, 0, 0)
 
     def off(self):
@@ -131,7 +242,7 @@ class LEDController:
         """Get the current LED color."""
         return self.current_color
 
-    def set_pixel(self, index: int, r: int, g: int, b: int):
+    def _set_pixel_spi(self, index: int, r: int, g: int, b: int):
         """
         Set a specific pixel to an RGB color.
 
@@ -145,23 +256,84 @@ class LEDController:
             return
 
         # Clamp values to 0-255
-        r = max(0, min(255, int(r)))
-        g = max(0, min(255, int(g)))
-        b = max(0, min(255, int(b)))
+        r, g, b = _clamp_rgb(r, g, b)
 
-        if self.pixels:
-            if USE_NEOPIXEL_SPI:
-                self.pixels[index] = (r, g, b)
-        else:
-            # Simulation mode - show which pixel changed
-            print(f"LED[{index}]: RGB({r}, {g}, {b})")
+        self.pixels[index] = (r, g, b)
+        self._dirty = True
+
+    def _set_pixel_sim(self, index: int, r: int, g: int, b: int):
+        """Simulation mode version of set_pixel."""
+        if index < 0 or index >= self.led_count:
+            return
+
+        r, g, b = _clamp_rgb(r, g, b)
 
-    def show(self):
-        """Update the LED display with current pixel values."""
-        if self.pixels:
-            if USE_NEOPIXEL_SPI:
+        # Show which pixel changed
+        print(f"LED[{index}]: RGB({r}, {g}, {b})")
+
+    def _write_frame(self, frame):
+        """
+        Queue a full strip frame for the writer thread to show.
+
+        The frame is copied into the pending buffer, so the caller may
+        reuse it immediately. Only the newest unsent frame is kept.
+
+        Unlike set_pixel, values are not clamped: frame must be a
+        (led_count, 3) uint8 array, so it is in range by construction.
+
+        Args:
+            frame: numpy uint8 array of RGB rows, one per LED
+        """
+        if not self.pixels:
+            return
+        with self._tx_lock:
+            np.copyto(self._tx_frame, frame)
+            self._tx_pending = True
+            self._dirty = True
+        self._tx_wake.set()
+
+    def _drop_pending_frame(self):
+        """Discard a queued frame that has not been sent yet."""
+        with self._tx_lock:
+            self._tx_pending = False
+
+    def _tx_loop(self):
+        """Writer thread: send the newest queued frame to the strip."""
+        while True:
+            self._tx_wake.wait()
+            self._tx_wake.clear()
+            if self._tx_shutdown:
+                return
+            with self._pixels_lock:
+                with self._tx_lock:
+                    if not self._tx_pending:
+                        continue
+                    self._tx_pending = False
+                    # neopixel_spi takes per-pixel tuples; converting here is
+                    # also the snapshot that frees the buffer for the next frame
+                    rows = list(map(tuple, self._tx_frame.tolist()))
+                self.pixels[:] = rows
                 self.pixels.show()
 
+    def render(self, intensity, color):
+        """
+        Scale a color by per-LED intensity and write the strip in one pass.
+
+        Shared by the loading animation and voice reactive lights. The color
+        product and the uint8 truncation both land in preallocated buffers,
+        so no intermediate arrays are allocated per frame.
+
+        Args:
+            intensity: Array of led_count factors (0.0 to 1.0)
+            color: RGB color as a length-3 array (0-255)
+        """
+        np.multiply(intensity[:, None], color, out=self._scratch)
+        np.copyto(self._frame, self._scratch, casting='unsafe')
+        self._write_frame(self._frame)
+
+    def _show_sim(self):
+        """Update the LED display with current pixel values (no-op when simulated)."""
+
     def start_loading_animation(self, color=(255, 255, 255), speed=0.03, tail_length=8):
         """
         Start a circular chase loading animation.
@@ -171,53 +343,49 @@ class LEDController:
             speed: Time in seconds between updates
             tail_length: Number of LEDs in the fading tail
         """
-        import threading
-        import time
-
-        # Stop any existing animation
+        # Stop any existing animation or flash
+        self._stop_flash()
         self.stop_loading_animation()
 
         self.loading_active = True
 
-        def loading_loop():
+        # Tail gradient: brightness fades from 1.0 to 0.1 along the tail
+        offsets = np.arange(tail_length)
+        fade = 1.0 - (offsets / tail_length) * 0.9
+        color_arr = np.asarray(color, dtype=np.float64)
+        tail = (color_arr[None, :] * fade[:, None]).astype(np.uint8)
+
+        async def loading_loop():
             """Circular chase animation."""
+            intensity = self._intensity
             position = 0
             while self.loading_active:
-                # Clear all pixels
-                if self.pixels:
-                    self.pixels.fill((0, 0, 0))
-
-                # Draw the tail with fading brightness
-                for i in range(tail_length):
-                    # Calculate pixel index (wrapping around)
-                    pixel_idx = (position - i) % self.led_count
-
-                    # Brightness fades from 1.0 to 0.1 along the tail
-                    brightness = 1.0 - (i / tail_length) * 0.9
-
-                    r = int(color[0] * brightness)
-                    g = int(color[1] * brightness)
-                    b = int(color[2] * brightness)
+                idx = (position - offsets) % self.led_count
 
-                    self.set_pixel(pixel_idx, r, g, b)
-
-                self.show()
+                if self.pixels:
+                    # Place the tail on the strip, then render it in one pass
+                    intensity.fill(0.0)
+                    intensity[idx] = fade
+                    self.render(intensity, color_arr)
+                else:
+                    for pixel_idx, (r, g, b) in zip(idx.tolist(), tail.tolist()):
+                        self.set_pixel(pixel_idx, r, g, b)
+                    self.show()
 
                 # Move to next position
                 position = (position + 1) % self.led_count
 
-                time.sleep(speed)
+                await asyncio.sleep(speed)
 
-        # Start the loading thread
-        self.loading_thread = threading.Thread(target=loading_loop, daemon=True)
-        self.loading_thread.start()
+        # Run on the shared animation loop
+        self.loading_task = asyncio.run_coroutine_threadsafe(loading_loop(), _get_animation_loop())
 
     def stop_loading_animation(self):
         """Stop the loading animation."""
-        if hasattr(self, 'loading_active'):
+        if self.loading_task is not None:
             self.loading_active = False
-            if hasattr(self, 'loading_thread') and self.loading_thread.is_alive():
-                self.loading_thread.join(timeout=0.5)
+            _cancel_animation(self.loading_task)
+            self.loading_task = None
             # Clear all pixels after stopping
             self.clear()
 
@@ -230,98 +398,122 @@ class LEDController:
             base_color: RGB tuple for the recording color (default green)
             speed: Time in seconds between brightness updates
         """
-        import threading
-        import time
-        import math
-
-        # Stop any existing animation
+        # Stop any existing animation or flash
+        self._stop_flash()
         self.stop_recording_animation()
 
         self.recording_active = True
 
-        def recording_loop():
+        # Precompute one breathing period; brightness oscillates between 0.2 and 1.0
+        period = _RECORD_PERIOD
+        bright = 0.2 + 0.8 * (np.sin(np.arange(period) * 0.1) + 1) / 2
+        rgb_table = [
+            tuple(rgb) for rgb in
+            (np.asarray(base_color, dtype=np.float64)[None, :] * bright[:, None]).astype(np.uint8).tolist()
+        ]
+
+        async def recording_loop():
             """Run the recording animation with breathing effect."""
             step = 0
+            last_rgb = None
             while self.recording_active:
-                # Use sine wave for smooth breathing effect
-                # Brightness oscillates between 0.2 and 1.0
-                brightness_factor = 0.2 + 0.8 * (math.sin(step * 0.1) + 1) / 2
-
-                # Calculate color with brightness factor
-                r = int(base_color[0] * brightness_factor)
-                g = int(base_color[1] * brightness_factor)
-                b = int(base_color[2] * brightness_factor)
+                i = step % period
+                rgb = rgb_table[i]
 
-                # Set all pixels to the pulsing color
+                # Set all pixels to the pulsing color: one fill and one SPI
+                # transfer per frame, skipped when the color did not change
                 if self.pixels:
-                    for i in range(self.led_count):
-                        self.set_pixel(i, r, g, b)
-                    self.show()
+                    if rgb != last_rgb:
+                        with self._pixels_lock:
+                            self.pixels.fill(rgb)
+                            self.pixels.show()
+                            self._dirty = True
+                        last_rgb = rgb
                 else:
                     # Simulation mode
-                    print(f"Recording LED: RGB({r}, {g}, {b}) - brightness: {brightness_factor:.2f}")
+                    print(f"Recording LED: RGB{rgb} - brightness: {bright[i]:.2f}")
 
                 step += 1
-                time.sleep(speed)
+                await asyncio.sleep(speed)
 
-        # Start the recording thread
-        self.recording_thread = threading.Thread(target=recording_loop, daemon=True)
-        self.recording_thread.start()
+        # Run on the shared animation loop
+        self.recording_task = asyncio.run_coroutine_threadsafe(recording_loop(), _get_animation_loop())
 
     def stop_recording_animation(self):
         """Stop the recording animation."""
-        if hasattr(self, 'recording_active'):
+        if self.recording_task is not None:
             self.recording_active = False
-            if hasattr(self, 'recording_thread') and self.recording_thread.is_alive():
-                self.recording_thread.join(timeout=0.5)
+            _cancel_animation(self.recording_task)
+            self.recording_task = None
             # Clear all pixels after stopping
             self.clear()
 
-    def flash_success(self, flashes=3, duration=0.2):
+    def _stop_flash(self):
+        """Cancel a flash sequence that is still running."""
+        if self.flash_task is not None:
+            _cancel_animation(self.flash_task)
+            self.flash_task = None
+
+    def _flash(self, color, flashes, duration, wait):
+        """
+        Run a flash sequence on the shared animation loop.
+
+        The whole on/off timeline is built up front; the caller only blocks
+        if wait is set.
+        """
+        self._stop_flash()
+
+        timeline = [(color, duration), ((0, 0, 0), duration)] * flashes
+
+        async def flash_loop():
+            for rgb, delay in timeline:
+                self.set_color(*rgb)
+                await asyncio.sleep(delay)
+
+        task = asyncio.run_coroutine_threadsafe(flash_loop(), _get_animation_loop())
+        self.flash_task = task
+        if wait:
+            try:
+                task.result()
+            except CancelledError:
+                # Interrupted by an animation, another flash or cleanup
+                pass
+
+    def flash_success(self, flashes=3, duration=0.2, wait=True):
         """
         Flash green to indicate successful operation (e.g., rules changed).
 
         Args:
             flashes: Number of times to flash
             duration: Duration of each flash in seconds
+            wait: Block until the flash sequence has finished (default, like
+                  the COB controllers); False returns immediately
         """
-        import time
-
         print(f"  ✅ Flashing green (success)")
+        self._flash((0, 255, 0), flashes, duration, wait)
 
-        for _ in range(flashes):
-            # Flash bright green
-            self.set_color(0, 255, 0)
-            time.sleep(duration)
-
-            # Turn off
-            self.set_color(0, 0, 0)
-            time.sleep(duration)
-
-    def flash_error(self, flashes=3, duration=0.3):
+    def flash_error(self, flashes=3, duration=0.3, wait=True):
         """
         Flash red to indicate error or no changes made.
 
         Args:
             flashes: Number of times to flash
             duration: Duration of each flash in seconds
+            wait: Block until the flash sequence has finished (default, like
+                  the COB controllers); False returns immediately
         """
-        import time
-
         print(f"  ❌ Flashing red (error/no changes)")
-
-        for _ in range(flashes):
-            # Flash bright red
-            self.set_color(255, 0, 0)
-            time.sleep(duration)
-
-            # Turn off
-            self.set_color(0, 0, 0)
-            time.sleep(duration)
+        self._flash((255, 0, 0), flashes, duration, wait)
 
     def cleanup(self):
         """Cleanup resources and turn off LEDs."""
+        self._stop_flash()
         self.stop_loading_animation()
         self.stop_recording_animation()
         self.clear()
+        if self._tx_thread is not None:
+            self._tx_shutdown = True
+            self._tx_wake.set()
+            self._tx_thread.join(timeout=0.5)
+            self._tx_thread = None
         print("LED controller cleanup complete")
@@ -16,12 +16,135 @@ Or directly: python apps/raspi/hardware/test_neopixel_spi.py
 
 import sys
 import time
+from contextlib import contextmanager
+
+import numpy as np
 
 # Configuration
 LED_COUNT = 32
 BRIGHTNESS = 0.5
 
 
+def _wheel_lut():
+    """Rainbow colors for all 256 wheel positions as a (256, 3) uint8 array."""
+    # Branchless: every section ramps one channel up and another down; only
+    # which channels differs, so pick them by section index
+    pos = np.arange(256)
+    section = np.minimum(pos // 85, 2)
+    phase = (pos - section * 85) * 3
+
+    up_channel = np.array([0, 2, 1])[section]
+    down_channel = np.array([1, 0, 2])[section]
+
+    lut = np.zeros((256, 3), dtype=np.uint8)
+    lut[pos, up_channel] = phase
+    lut[pos, down_channel] = 255 - phase
+    return lut
+
+
+# Precomputed once: rainbow color per wheel position, and each LED's base position
+WHEEL_LUT = _wheel_lut()
+BASE_POSITIONS = np.arange(LED_COUNT) * 256 // LED_COUNT
+
+# Rainbow phase: wheel positions advanced per second, in integer nanoseconds
+RAINBOW_SCALE_NUM = 50
+NS_PER_SECOND = 1_000_000_000
+RAINBOW_DURATION_NS = 3 * NS_PER_SECOND
+
+# Basic color test patterns: one contiguous RGB row per name
+NAMES = ('Red', 'Green', 'Blue', 'White', 'Yellow', 'Cyan', 'Magenta')
+COLOR_TABLE = np.array([
+    [255, 0, 0],
+    [0, 255, 0],
+    [0, 0, 255],
+    [255, 255, 255],
+    [255, 255, 0],
+    [0, 255, 255],
+    [255, 0, 255],
+], dtype=np.uint8)
+
+
+def fast_fill(pixels, color):
+    """
+    Fill the whole strip with one color by writing the pixel buffer directly.
+
+    PixelBuf.fill() sets each pixel in a Python loop; for a solid color the
+    buffer is just one pixel's bytes repeated, so it can be written in one
+    slice assignment. Falls back to fill() if the buffer layout is unexpected.
+    """
+    try:
+        order = pixels._byteorder
+        offset = pixels._offset
+        step = pixels._pixel_step
+        pre = pixels._pre_brightness_buffer
+        post = pixels._post_brightness_buffer
+        brightness = pixels._brightness
+    except AttributeError:
+        pixels.fill(color)
+        return
+    if step != 3:
+        pixels.fill(color)
+        return
+
+    # One pixel in wire order (e.g. GRB); byteorder[i] is where channel i goes
+    pixel = bytearray(3)
+    for channel, value in zip(order, color):
+        pixel[channel] = value
+    end = offset + 3 * len(pixels)
+
+    # Like PixelBuf: the unscaled copy is only kept once brightness != 1.0
+    if pre is not None:
+        pre[offset:end] = bytes(pixel) * len(pixels)
+    post[offset:end] = bytes(int(v * brightness) for v in pixel) * len(pixels)
+
+
+# Encoded SPI payloads for solid colors, keyed by (color, brightness)
+_solid_cache = {}
+
+
+def show_solid(pixels, color):
+    """
+    Show one color on the whole strip, bypassing NeoPixel_SPI's encoder.
+
+    NeoPixel_SPI.show() turns every bit of the pixel buffer into an SPI byte
+    in a Python loop. A solid color is one encoded pixel repeated, so it is
+    encoded once, cached, and written to the SPI device directly. The pixel
+    buffer is still updated so later show() calls agree. Falls back to
+    fast_fill() + show() if the driver internals are not as expected.
+    """
+    fast_fill(pixels, color)
+    try:
+        spi = pixels._spi
+        reset = pixels._reset
+        bit0, bit1 = pixels._bit0, pixels._bit1
+        post = pixels._post_brightness_buffer
+        offset = pixels._offset
+    except AttributeError:
+        pixels.show()
+        return
+
+    key = (tuple(color), pixels.brightness)
+    payload = _solid_cache.get(key)
+    if payload is None:
+        # Same MSB-first bit -> byte pattern as NeoPixel_SPI._transmogrify
+        pixel = post[offset:offset + 3]
+        encoded = bytes(bit1 if byte >> i & 1 else bit0 for byte in pixel for i in range(7, -1, -1))
+        payload = reset + encoded * len(pixels) + reset
+        _solid_cache[key] = payload
+
+    with spi as bus:
+        bus.write(payload)
+
+
+@contextmanager
+def cleared_on_exit(pixels):
+    """Turn the strip off once when the block exits, even on error."""
+    try:
+        yield pixels
+    finally:
+        show_solid(pixels, (0, 0, 0))
+
+
 def test_imports():
     """Test that required libraries are installed."""
     print("=" * 50)
@@ -114,27 +237,13 @@ def test_basic_colors(pixels):
     print("Test 4: Basic Colors")
     print("=" * 50)
 
-    colors = [
-        ("Red", (255, 0, 0)),
-        ("Green", (0, 255, 0)),
-        ("Blue", (0, 0, 255)),
-        ("White", (255, 255, 255)),
-        ("Yellow", (255, 255, 0)),
-        ("Cyan", (0, 255, 255)),
-        ("Magenta", (255, 0, 255)),
-    ]
-
     try:
-        for name, color in colors:
+        for name, color in zip(NAMES, map(tuple, COLOR_TABLE.tolist())):
             print(f"  Setting {name}... ", end="", flush=True)
-            pixels.fill(color)
-            pixels.show()
+            show_solid(pixels, color)
             print(f"RGB{color}")
             time.sleep(0.5)
 
-        # Turn off
-        pixels.fill((0, 0, 0))
-        pixels.show()
         print("  [OK] Basic colors test passed")
         return True
     except Exception as e:
@@ -149,16 +258,14 @@ def test_brightness(pixels):
     print("=" * 50)
 
     try:
-        pixels.fill((255, 255, 255))
+        fast_fill(pixels, (255, 255, 255))
 
         for brightness in [0.1, 0.3, 0.5, 0.7, 1.0, 0.5]:
             print(f"  Brightness: {brightness * 100:.0f}%")
             pixels.brightness = brightness
-            pixels.show()
+            show_solid(pixels, (255, 255, 255))
             time.sleep(0.4)
 
-        pixels.fill((0, 0, 0))
-        pixels.show()
         print("  [OK] Brightness test passed")
         return True
     except Exception as e:
@@ -177,23 +284,30 @@ def test_individual_pixels(pixels):
         pixels.fill((0, 0, 0))
         pixels.show()
 
-        # Chase a single red pixel
+        # Bind hot attributes to locals for the chase loops
+        show = pixels.show
+        sleep = time.sleep
+        off, red, blue = (0, 0, 0), (255, 0, 0), (0, 0, 255)
+
+        # Chase a single red pixel; only the previously lit pixel is cleared
         print("  Running pixel chase...")
+        prev = None
         for i in range(LED_COUNT):
-            pixels.fill((0, 0, 0))
-            pixels[i] = (255, 0, 0)
-            pixels.show()
-            time.sleep(0.03)
+            if prev is not None:
+                pixels[prev] = off
+            pixels[i] = red
+            show()
+            prev = i
+            sleep(0.03)
 
         # Reverse with blue
         for i in range(LED_COUNT - 1, -1, -1):
-            pixels.fill((0, 0, 0))
-            pixels[i] = (0, 0, 255)
-            pixels.show()
-            time.sleep(0.03)
+            pixels[prev] = off
+            pixels[i] = blue
+            show()
+            prev = i
+            sleep(0.03)
 
-        pixels.fill((0, 0, 0))
-        pixels.show()
         print("  [OK] Individual pixel test passed")
         return True
     except Exception as e:
@@ -207,31 +321,24 @@ def test_rainbow(pixels):
     print("Test 7: Rainbow Animation")
     print("=" * 50)
 
-    def wheel(pos):
-        """Generate rainbow colors across 0-255 positions."""
-        if pos < 85:
-            return (pos * 3, 255 - pos * 3, 0)
-        elif pos < 170:
-            pos -= 85
-            return (255 - pos * 3, 0, pos * 3)
-        else:
-            pos -= 170
-            return (0, pos * 3, 255 - pos * 3)
-
     try:
         print("  Running rainbow cycle (3 seconds)...")
-        start = time.time()
-
-        while time.time() - start < 3:
-            offset = int((time.time() - start) * 50) % 256
-            for i in range(LED_COUNT):
-                pixel_index = (i * 256 // LED_COUNT + offset) % 256
-                pixels[i] = wheel(pixel_index)
-            pixels.show()
-            time.sleep(0.02)
+        # Read the clock once per frame; bind hot attributes to locals
+        monotonic_ns = time.monotonic_ns
+        sleep = time.sleep
+        show = pixels.show
+        wheel_lut = WHEEL_LUT
+        base_positions = BASE_POSITIONS
+        start_ns = monotonic_ns()
+
+        # Integer-only phase: no float subtraction/scaling per frame
+        while (elapsed_ns := monotonic_ns() - start_ns) < RAINBOW_DURATION_NS:
+            offset = (elapsed_ns * RAINBOW_SCALE_NUM // NS_PER_SECOND) & 0xFF
+            colors = wheel_lut[(base_positions + offset) & 0xFF]
+            pixels[:] = list(map(tuple, colors.tolist()))
+            show()
+            sleep(0.02)
 
-        pixels.fill((0, 0, 0))
-        pixels.show()
         print("  [OK] Rainbow animation test passed")
         return True
     except Exception as e:
@@ -264,12 +371,13 @@ def main():
         print("\n[ABORT] NeoPixel initialization failed")
         sys.exit(1)
 
-    # Test 4-7: LED tests
-    results = []
-    results.append(("Basic Colors", test_basic_colors(pixels)))
-    results.append(("Brightness", test_brightness(pixels)))
-    results.append(("Individual Pixels", test_individual_pixels(pixels)))
-    results.append(("Rainbow Animation", test_rainbow(pixels)))
+    # Test 4-7: LED tests. The strip is cleared once when they finish
+    with cleared_on_exit(pixels):
+        results = []
+        results.append(("Basic Colors", test_basic_colors(pixels)))
+        results.append(("Brightness", test_brightness(pixels)))
+        results.append(("Individual Pixels", test_individual_pixels(pixels)))
+        results.append(("Rainbow Animation", test_rainbow(pixels)))
 
     # Summary
     print("\n" + "=" * 50)
@@ -293,10 +401,6 @@ def main():
     else:
         print("\n  Some tests failed. Check wiring and SPI configuration.")
 
-    # Cleanup
-    pixels.fill((0, 0, 0))
-    pixels.show()
-
 
 if __name__ == "__main__":
     main()
@@ -7,13 +7,14 @@ Tests the random bubble pattern with microphone input.
 Run with: python apps/raspi/hardware/test_voice_reactive.py
 """
 
+import os
 import sys
 import time
-from pathlib import Path
 
 # Add parent directories to path
-ROOT_DIR = Path(__file__).parent.parent.parent.parent
-sys.path.insert(0, str(ROOT_DIR))
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
 
 # Configuration
 LED_COUNT = 32
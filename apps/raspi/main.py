@@ -4,58 +4,261 @@ AdaptLight RASPi Application
 Voice-controlled smart lighting using the SMgenerator library.
 """
 
+import binascii
+import hashlib
+import logging
+import logging.handlers
 import os
+import pickle
+import queue
+import re
 import sys
 import time
 import signal
-import yaml
+import threading
+import traceback
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import partial
 from pathlib import Path
 from typing import Optional
 
 # Add parent directories to path for imports
-ROOT_DIR = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(ROOT_DIR))
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+# Load .env file from root directory, once per process tree. Skipped when the
+# launcher already exported it (ADAPTLIGHT_ENV_LOADED, see run_raspi.sh), and
+# only read if it is a regular file, so a FIFO at that path can't hang startup
+_ENV_FILE = os.path.join(ROOT_DIR, '.env')
+if not os.environ.get('ADAPTLIGHT_ENV_LOADED') and os.path.isfile(_ENV_FILE):
+    from dotenv import load_dotenv
+    load_dotenv(_ENV_FILE)
+    os.environ['ADAPTLIGHT_ENV_LOADED'] = '1'
+
+# SIMD base64 (SSSE3/NEON) for camera frames when pybase64 is installed.
+# Either way the encoder's buffer is read directly, with no bytes copy
+try:
+    from pybase64 import b64encode as _b64encode
+except ImportError:
+    def _b64encode(data) -> bytes:
+        return binascii.b2a_base64(data, newline=False)
+
+# Runtime event log (button presses, hooks, tool timings). Records go through
+# a queue to a listener thread, so callbacks never block on stdout.
+logger = logging.getLogger('adaptlight')
+_log_listener = None
+
+
+def _setup_logging(verbose: bool = False):
+    """Route the adaptlight logger through a background queue listener."""
+    global _log_listener
+    logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+    if _log_listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.propagate = False
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter('%(message)s'))
+    _log_listener = logging.handlers.QueueListener(log_queue, stream)
+    _log_listener.start()
+
+
+def _stop_logging():
+    """Flush queued log records and stop the listener thread."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+# A "${VAR}" reference anywhere in a config string
+_ENV_RE = re.compile(r'\$\{([A-Za-z_][A-Za-z0-9_]*)\}')
+
+
+def _expand_env(obj, environ=os.environ):
+    """
+    Replace "${VAR}" references in string values with their environment
+    value ('' if unset), whether the value is the whole string or part of it.
+
+    Containers with nothing to expand are returned as-is rather than copied.
+
+    Args:
+        obj: Parsed config value (dict, list, str or scalar)
+        environ: Mapping to resolve variables from (default: os.environ)
+    """
+    if isinstance(obj, str):
+        if '${' not in obj:
+            return obj
+        return _ENV_RE.sub(lambda m: environ.get(m.group(1), ''), obj)
+    elif isinstance(obj, dict):
+        # Single pass; copy only once the first value actually changes
+        expanded = None
+        for k, v in obj.items():
+            new = _expand_env(v, environ)
+            if new is not v:
+                if expanded is None:
+                    expanded = dict(obj)
+                expanded[k] = new
+        return obj if expanded is None else expanded
+    elif isinstance(obj, list):
+        expanded = None
+        for i, item in enumerate(obj):
+            new = _expand_env(item, environ)
+            if new is not item:
+                if expanded is None:
+                    expanded = list(obj)
+                expanded[i] = new
+        return obj if expanded is None else expanded
+    return obj
+
+
+def _config_cache_path(config_path: Path) -> Path:
+    """Per-config pickle location under the user cache dir (XDG_CACHE_HOME)."""
+    cache_dir = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'adaptlight'
+    digest = hashlib.sha1(str(config_path).encode()).hexdigest()[:16]
+    return cache_dir / f"{config_path.stem}-{digest}.pkl"
+
+
+def _parse_yaml_cached(config_path) -> dict:
+    """
+    Parse a YAML file, reusing a pickled copy while the file is unchanged.
+
+    The pickle lives in ~/.cache/adaptlight, one per config path, and is
+    keyed on the source path, mtime and size. It holds the raw parsed YAML,
+    before environment expansion, so no secrets from the environment are
+    written to disk and changed env vars take effect without invalidation.
+    On a cache hit PyYAML is never imported.
+    """
+    config_path = Path(config_path).resolve()
+    cache_path = _config_cache_path(config_path)
+    st = os.stat(config_path)
+    key = (str(config_path), st.st_mtime_ns, st.st_size)
+
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_key, config = pickle.load(f)
+        if cached_key == key:
+            return config
+    except Exception:
+        pass
+
+    # PyYAML is only needed on a cache miss. Prefer the libyaml C bindings
+    # when PyYAML was built with them
+    import yaml
+    try:
+        from yaml import CSafeLoader as YamlLoader
+    except ImportError:
+        from yaml import SafeLoader as YamlLoader
 
-# Load .env file from root directory
-from dotenv import load_dotenv
-load_dotenv(ROOT_DIR / '.env')
+    with open(config_path) as f:
+        config = yaml.load(f, Loader=YamlLoader)
+
+    # Write atomically; a read-only install just skips the cache
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((key, config), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
 
-from brain import SMgenerator
-from brain.processing.vision_runtime import VisionRuntime
-from brain.processing.api_runtime import APIRuntime
-from brain.processing.audio_runtime import AudioRuntime
-from brain.processing.volume_runtime import VolumeRuntime
-from brain.apis.api_executor import APIExecutor
+    return config
 
-# Import supabase client for logging
-from . import supabase_client
 
+def load_config(config_path: str = None, environ=None) -> dict:
+    """
+    Load configuration from YAML file.
 
-def load_config(config_path: str = None) -> dict:
-    """Load configuration from YAML file."""
+    Args:
+        config_path: Path to config file (default: config.yaml next to this module)
+        environ: Mapping used for ${VAR} expansion (default: os.environ)
+    """
     if config_path is None:
         config_path = Path(__file__).parent / 'config.yaml'
 
-    with open(config_path) as f:
-        config = yaml.safe_load(f)
+    config = _parse_yaml_cached(config_path)
+
+    # Expand environment variables. Looked up directly rather than from a
+    # dict(os.environ) snapshot: the config references only a few variables,
+    # and copying the whole environment costs more than those lookups
+    return _expand_env(config, os.environ if environ is None else environ)
+
+
+# Command sessions sent to Supabase in one insert, at most
+_SUPABASE_BATCH_SIZE = 16
+# Seconds a feedback press waits for its command's session insert
+_SUPABASE_FEEDBACK_WAIT = 10.0
+
+# Camera frames are sent to the vision runtime as JPEG (or WebP) data URLs
+_JPEG_DATA_URL_PREFIX = b'data:image/jpeg;base64,'
+_WEBP_DATA_URL_PREFIX = b'data:image/webp;base64,'
+
+# SMgenerator events the app reacts to, mapped to handler method names
+_SMGEN_HOOKS = (
+    ('processing_start', '_on_processing_start'),
+    ('processing_end', '_on_processing_end'),
+    ('tool_end', '_on_tool_end'),
+    ('error', '_on_error'),
+    ('message_ready', '_on_message_ready'),
+)
+
 
-    # Expand environment variables
-    def expand_env(obj):
-        if isinstance(obj, str) and obj.startswith('${') and obj.endswith('}'):
-            env_var = obj[2:-1]
-            return os.environ.get(env_var, '')
-        elif isinstance(obj, dict):
-            return {k: expand_env(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [expand_env(item) for item in obj]
-        return obj
+def _frame_encoder(vision_config: dict):
+    """
+    Pick the image encoder for camera frames sent to the vision runtime.
 
-    return expand_env(config)
+    The vision models read Q50-60 images fine; smaller payloads mean less
+    base64 work and a shorter upload, and WebP is smaller still. JPEG goes
+    through libjpeg-turbo (SIMD DCT/Huffman) when PyTurboJPEG and the
+    library are installed, otherwise through cv2.imencode.
+
+    Args:
+        vision_config: The 'vision' config section
+
+    Returns:
+        (encode, data_url_prefix), where encode(frame_bgr) returns the
+        encoded image as a bytes-like object
+    """
+    import cv2
+
+    if str(vision_config.get('encode_format', 'jpeg')).lower() == 'webp':
+        params = [cv2.IMWRITE_WEBP_QUALITY, int(vision_config.get('webp_quality', 50))]
+        return (lambda frame: cv2.imencode('.webp', frame, params)[1]), _WEBP_DATA_URL_PREFIX
+
+    quality = int(vision_config.get('jpeg_quality', 60))
+    try:
+        from turbojpeg import TurboJPEG, TJSAMP_420
+        jpeg = TurboJPEG()
+    except (ImportError, OSError, RuntimeError):
+        params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+        return (lambda frame: cv2.imencode('.jpg', frame, params)[1]), _JPEG_DATA_URL_PREFIX
+
+    # Frames are BGR, TurboJPEG's default pixel format; 4:2:0 like OpenCV
+    return (lambda frame: jpeg.encode(frame, quality=quality, jpeg_subsample=TJSAMP_420)), _JPEG_DATA_URL_PREFIX
 
 
 class AdaptLightRaspi:
     """Main application class for RASPi."""
 
+    # Fixed attribute set: faster attribute access, no per-instance __dict__
+    __slots__ = (
+        'api_executor', 'api_runtime', 'audio_runtime', 'button', 'camera',
+        'config', 'debug', 'device_id', 'feedback_no_button',
+        'feedback_pending', 'feedback_yes_button', 'is_recording', 'last_session_id',
+        'led', 'mic_controller', 'reactive_led', 'record_button', 'running', 'smgen',
+        'tts', 'verbose', 'vision_runtime', 'voice', 'voice_reactive',
+        'volume_runtime', '_api_tick_interval_ms', '_camera_running', '_camera_thread',
+        '_commands', '_execute_unified_state', '_hooks', '_last_api_tick_ms', '_loading_led',
+        '_events', '_free_frames', '_pool', '_session_future', '_supabase_queue',
+        '_supabase_thread', '_tts_future', '_tts_lock', '_use_picamera', '_vision_queue',
+        '_vision_session_id', '_vision_thread'
+    )
+
     def __init__(self, config_path: str = None, debug: bool = False, verbose: bool = False):
         """
         Initialize the application.
@@ -68,16 +271,38 @@ class AdaptLightRaspi:
         self.config = load_config(config_path)
         self.debug = debug
         self.verbose = verbose
+        _setup_logging(verbose)
 
         self.is_recording = False
         self.voice_reactive = None
         self.running = True
+        # Main-thread dispatch queue: button handlers are posted here and run
+        # by run(); the signal handler posts None to stop. SimpleQueue.put is
+        # reentrant, so it is safe to call from a signal handler
+        self._events = queue.SimpleQueue()
+        # Slow handlers (voice commands, feedback) run in order on their own
+        # thread, so the main loop keeps ticking and short button presses
+        # aren't stuck behind an LLM call
+        self._commands = queue.SimpleQueue()
+        threading.Thread(target=self._command_loop, name='adaptlight-commands', daemon=True).start()
+        # Pool for short background jobs (LED driver setup, TTS). Long-running
+        # loops (camera, vision, Supabase logging) get their own daemon threads
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='adaptlight')
 
         # Session tracking for Supabase feedback
         self.last_session_id = None
         self.feedback_pending = False
+        self._session_future = None
+        self._supabase_queue = queue.SimpleQueue()
+        self._supabase_thread = None
         self.device_id = self.config.get('device', {}).get('id', 'lamp1')
 
+        # The replicate client reads its token from the environment; export
+        # it once here rather than on every transcription
+        replicate_token = self.config.get('replicate', {}).get('api_token')
+        if replicate_token:
+            os.environ['REPLICATE_API_TOKEN'] = replicate_token
+
         # Initialize Brain
         speech_config = self.config.get('speech', {})
         representation_config = self.config.get('representation', {})
@@ -96,25 +321,36 @@ class AdaptLightRaspi:
             'speech_mode': speech_config.get('mode', 'default'),
             'vision_config': vision_config,  # Pass vision capabilities to agent
         }
+        # Imported here so `--help` and config tooling don't pay for the agent
+        # stack. The reactive runtimes below are imported only when enabled
+        from brain import SMgenerator
         self.smgen = SMgenerator(brain_config)
 
         # Initialize Vision Runtime (for camera-reactive features)
         vision_config = self.config.get('vision', {})
-        self.vision_runtime = VisionRuntime(
-            smgen=self.smgen,
-            config=vision_config,
-            openai_api_key=self.config['openai']['api_key'],
-            verbose=verbose
-        ) if vision_config.get('enabled') else None
+        self.vision_runtime = None
+        if vision_config.get('enabled'):
+            from brain.processing.vision_runtime import VisionRuntime
+            self.vision_runtime = VisionRuntime(
+                smgen=self.smgen,
+                config=vision_config,
+                openai_api_key=self.config['openai']['api_key'],
+                verbose=verbose
+            )
 
         # Initialize API Runtime (for api-reactive features)
         api_config = self.config.get('api', {})
-        self.api_executor = APIExecutor(timeout=15.0) if api_config.get('enabled') else None
-        self.api_runtime = APIRuntime(
-            smgen=self.smgen,
-            api_executor=self.api_executor,
-            config=api_config
-        ) if api_config.get('enabled') else None
+        self.api_executor = None
+        self.api_runtime = None
+        if api_config.get('enabled'):
+            from brain.apis.api_executor import APIExecutor
+            from brain.processing.api_runtime import APIRuntime
+            self.api_executor = APIExecutor(timeout=15.0)
+            self.api_runtime = APIRuntime(
+                smgen=self.smgen,
+                api_executor=self.api_executor,
+                config=api_config
+            )
 
         # Track API tick timing
         self._last_api_tick_ms = 0
@@ -122,25 +358,29 @@ class AdaptLightRaspi:
 
         # Initialize Audio Runtime (for audio-reactive features via LLM)
         audio_config = self.config.get('audio', {})
-        self.audio_runtime = AudioRuntime(
-            smgen=self.smgen,
-            config=audio_config,
-            openai_api_key=self.config['openai']['api_key']
-        ) if audio_config.get('enabled') else None
+        self.audio_runtime = None
+        if audio_config.get('enabled'):
+            from brain.processing.audio_runtime import AudioRuntime
+            self.audio_runtime = AudioRuntime(
+                smgen=self.smgen,
+                config=audio_config,
+                openai_api_key=self.config['openai']['api_key']
+            )
 
         # Initialize Volume Runtime (for volume-reactive features)
         volume_config = self.config.get('volume', {})
-        self.volume_runtime = VolumeRuntime(
-            smgen=self.smgen,
-            config=volume_config
-        ) if volume_config.get('enabled') else None
-
-        # Register hooks for RASPi-specific feedback
-        self.smgen.on('processing_start', self._on_processing_start)
-        self.smgen.on('processing_end', self._on_processing_end)
-        self.smgen.on('tool_end', self._on_tool_end)
-        self.smgen.on('error', self._on_error)
-        self.smgen.on('message_ready', self._on_message_ready)
+        self.volume_runtime = None
+        if volume_config.get('enabled'):
+            from brain.processing.volume_runtime import VolumeRuntime
+            self.volume_runtime = VolumeRuntime(
+                smgen=self.smgen,
+                config=volume_config
+            )
+
+        # Register hooks for RASPi-specific feedback. Bound methods are
+        # resolved once and kept so cleanup() can unregister the same objects
+        self._hooks = {event: getattr(self, name) for event, name in _SMGEN_HOOKS}
+        self.smgen.on_many(self._hooks)
 
         # Initialize hardware (lazy load to avoid import errors on non-Pi)
         self.led = None
@@ -149,10 +389,13 @@ class AdaptLightRaspi:
         self.record_button = None
         self.feedback_yes_button = None
         self.tts = None  # Text-to-speech
-        self.tts_thread = None  # Background TTS thread for early generation
+        self._tts_future = None  # Background TTS job for early generation
+        self._tts_lock = threading.Lock()  # Only one speak() at a time
         self.feedback_no_button = None
         self.voice = None
         self.mic_controller = None  # Unified mic controller
+        self._execute_unified_state = None  # Bound once light_states is wired up
+        self._loading_led = None  # reactive_led or led, set by _init_hardware
 
         self._init_hardware()
         self._init_voice()
@@ -167,88 +410,39 @@ class AdaptLightRaspi:
         """Initialize hardware controllers."""
         try:
             hw_config = self.config['hardware']
+            reactive_config = self.config.get('reactive_lights', {})
 
+            # LED drivers block during setup (CobLedSerial waits ~2s for the
+            # Arduino to reset, NeoPixel claims an SPI bus), so build them on
+            # worker threads while the buttons are set up here. GPIO PWM COB
+            # LEDs share gpiozero's pin factory with the buttons, so those
+            # are still created inline.
             if hw_config['led_type'] == 'cob':
-                from .hardware.cobled.cobled import CobLed
-                self.led = CobLed(
-                    red_pin=hw_config['cob_red_pin'],
-                    green_pin=hw_config['cob_green_pin'],
-                    blue_pin=hw_config['cob_blue_pin'],
-                    max_duty_cycle=hw_config.get('cob_max_duty_cycle', 2.0),
-                    frequency=hw_config.get('cob_pwm_frequency', 1000)
-                )
-            elif hw_config['led_type'] == 'cob_serial':
-                from .hardware.cobled.cobled_serial import CobLedSerial
-                self.led = CobLedSerial(
-                    port=hw_config.get('cob_serial_port', '/dev/ttyAMA0'),
-                    baudrate=hw_config.get('cob_serial_baudrate', 115200),
-                    brightness=hw_config.get('led_brightness', 1.0)
-                )
+                self.led = self._create_led(hw_config)
+                led_future = None
             else:
-                from .hardware.led_controller import LEDController
-                self.led = LEDController(
-                    num_leds=hw_config.get('led_count', 16),
-                    pin=hw_config.get('led_pin', 18),
-                    brightness=hw_config.get('led_brightness', 0.3)
-                )
-
-            from .hardware.button_controller import ButtonController
-            self.button = ButtonController(
-                button_pin=hw_config['button_pin'],
-                bounce_time=self.config['button']['bounce_time']
-            )
-            self.button.set_config(
-                double_click_threshold=self.config['button']['double_click_threshold'],
-                hold_threshold=self.config['button']['hold_threshold']
+                led_future = self._pool.submit(self._create_led, hw_config)
+            reactive_future = (
+                self._pool.submit(self._create_reactive_led, reactive_config)
+                if reactive_config.get('enabled', False) else None
             )
-            self.button.on_single_click = lambda: self._handle_button('button_click')
-            self.button.on_double_click = lambda: self._handle_button('button_double_click')
-            self.button.on_hold = lambda: self._handle_button('button_hold')
-            self.button.on_release = lambda: self._handle_button('button_release')
-
-            if hw_config.get('record_button_pin'):
-                self.record_button = ButtonController(
-                    button_pin=hw_config['record_button_pin'],
-                    bounce_time=self.config['button']['bounce_time']
-                )
-                self.record_button.on_single_click = self._handle_record_button
-
-            # Initialize feedback buttons (Yes/No for Supabase)
-            if hw_config.get('feedback_yes_pin'):
-                self.feedback_yes_button = ButtonController(
-                    button_pin=hw_config['feedback_yes_pin'],
-                    bounce_time=self.config['button']['bounce_time']
-                )
-                self.feedback_yes_button.on_single_click = lambda: self._handle_feedback(True)
-                print(f"Feedback YES button on GPIO {hw_config['feedback_yes_pin']}")
-
-            if hw_config.get('feedback_no_pin'):
-                self.feedback_no_button = ButtonController(
-                    button_pin=hw_config['feedback_no_pin'],
-                    bounce_time=self.config['button']['bounce_time']
-                )
-                self.feedback_no_button.on_single_click = lambda: self._handle_feedback(False)
-                print(f"Feedback NO button on GPIO {hw_config['feedback_no_pin']}")
-
-            # Initialize reactive lights (NeoPixel for voice feedback)
-            reactive_config = self.config.get('reactive_lights', {})
-            if reactive_config.get('enabled', False):
-                from .hardware.led_controller import LEDController
-                self.reactive_led = LEDController(
-                    led_count=reactive_config.get('led_count', 35),
-                    brightness=reactive_config.get('brightness', 0.5),
-                    spi_bus_id=reactive_config.get('spi_bus', 1)
-                )
-                print(f"Reactive NeoPixel initialized: {reactive_config.get('led_count')} LEDs on GPIO {reactive_config.get('pin')}")
+            try:
+                self._init_buttons(hw_config)
+            finally:
+                if led_future is not None:
+                    self.led = led_future.result()
+                if reactive_future is not None:
+                    self.reactive_led = reactive_future.result()
 
             # Initialize light_states globals
-            from .output.light_states import set_led_controller, set_state_machine
+            from .output.light_states import execute_unified_state, set_led_controller, set_state_machine
             set_led_controller(self.led)
             set_state_machine(self.smgen.state_machine)
+            self._execute_unified_state = execute_unified_state
 
             # Initialize voice reactive controller
             # Use reactive_led for voice reactive if available, else fall back to main led
-            reactive_led_target = self.reactive_led if self.reactive_led else self.led
+            reactive_led_target = self.reactive_led or self.led
             if reactive_led_target and self.config['voice'].get('reactive_enabled', True):
                 try:
                     from .voice.reactive import VoiceReactiveLight
@@ -275,12 +469,100 @@ class AdaptLightRaspi:
             print(f"Hardware initialization failed: {e}")
             print("Running in simulation mode")
 
+        # Loading animations go to the reactive strip if present, else the main
+        # light. Resolved once so the per-command hooks don't re-branch
+        self._loading_led = self.reactive_led or self.led
+
+    def _create_led(self, hw_config):
+        """Create the main light's LED driver for the configured led_type."""
+        if hw_config['led_type'] == 'cob':
+            from .hardware.cobled.cobled import CobLed
+            return CobLed(
+                red_pin=hw_config['cob_red_pin'],
+                green_pin=hw_config['cob_green_pin'],
+                blue_pin=hw_config['cob_blue_pin'],
+                max_duty_cycle=hw_config.get('cob_max_duty_cycle', 2.0),
+                frequency=hw_config.get('cob_pwm_frequency', 1000)
+            )
+        elif hw_config['led_type'] == 'cob_serial':
+            from .hardware.cobled.cobled_serial import CobLedSerial
+            return CobLedSerial(
+                port=hw_config.get('cob_serial_port', '/dev/ttyAMA0'),
+                baudrate=hw_config.get('cob_serial_baudrate', 115200),
+                brightness=hw_config.get('led_brightness', 1.0)
+            )
+        else:
+            from .hardware.led_controller import LEDController
+            return LEDController(
+                led_count=hw_config.get('led_count', 16),
+                led_pin=hw_config.get('led_pin', 18),
+                brightness=hw_config.get('led_brightness', 0.3)
+            )
+
+    def _create_reactive_led(self, reactive_config):
+        """Create the NeoPixel strip used for voice feedback."""
+        from .hardware.led_controller import LEDController
+        reactive_led = LEDController(
+            led_count=reactive_config.get('led_count', 35),
+            brightness=reactive_config.get('brightness', 0.5),
+            spi_bus_id=reactive_config.get('spi_bus', 1)
+        )
+        print(f"Reactive NeoPixel initialized: {reactive_config.get('led_count')} LEDs on GPIO {reactive_config.get('pin')}")
+        return reactive_led
+
+    def _init_buttons(self, hw_config):
+        """Create the main, record and feedback buttons and wire their callbacks."""
+        from .hardware.button_controller import ButtonController
+        self.button = ButtonController(
+            button_pin=hw_config['button_pin'],
+            bounce_time=self.config['button']['bounce_time']
+        )
+        self.button.set_config(
+            double_click_threshold=self.config['button']['double_click_threshold'],
+            hold_threshold=self.config['button']['hold_threshold']
+        )
+        # Button callbacks fire on gpiozero's threads; they only post the
+        # handler to the main loop (quick state changes) or the command
+        # thread (anything that can block). partial() pre-binds the arguments
+        post = self._post
+        self.button.on_single_click = partial(post, self._handle_button, 'button_click')
+        self.button.on_double_click = partial(post, self._handle_button, 'button_double_click')
+        self.button.on_hold = partial(post, self._handle_button, 'button_hold')
+        self.button.on_release = partial(post, self._handle_button, 'button_release')
+
+        if hw_config.get('record_button_pin'):
+            self.record_button = ButtonController(
+                button_pin=hw_config['record_button_pin'],
+                bounce_time=self.config['button']['bounce_time']
+            )
+            self.record_button.on_single_click = partial(self._post_command, self._handle_record_button)
+
+        # Initialize feedback buttons (Yes/No for Supabase)
+        if hw_config.get('feedback_yes_pin'):
+            self.feedback_yes_button = ButtonController(
+                button_pin=hw_config['feedback_yes_pin'],
+                bounce_time=self.config['button']['bounce_time']
+            )
+            self.feedback_yes_button.on_single_click = partial(self._post_command, self._handle_feedback, True)
+            print(f"Feedback YES button on GPIO {hw_config['feedback_yes_pin']}")
+
+        if hw_config.get('feedback_no_pin'):
+            self.feedback_no_button = ButtonController(
+                button_pin=hw_config['feedback_no_pin'],
+                bounce_time=self.config['button']['bounce_time']
+            )
+            self.feedback_no_button.on_single_click = partial(self._post_command, self._handle_feedback, False)
+            print(f"Feedback NO button on GPIO {hw_config['feedback_no_pin']}")
+
     def _init_camera(self):
         """Initialize camera for vision processing."""
         self.camera = None
-        self.camera_thread = None
+        self._camera_thread = None
         self._camera_running = False
         self._vision_session_id = None
+        self._vision_queue = None
+        self._vision_thread = None
+        self._free_frames = None
         self._use_picamera = False
 
         vision_config = self.config.get('vision', {})
@@ -293,7 +575,6 @@ class AdaptLightRaspi:
         # Try picamera2 first (for Pi Camera ribbon cable)
         try:
             from picamera2 import Picamera2
-            import threading
 
             print(f"📷 Initializing Pi Camera (picamera2)...")
             self.camera = Picamera2()
@@ -306,9 +587,10 @@ class AdaptLightRaspi:
             else:
                 print(f"   Found: {camera_info[0].get('Model', 'unknown')}")
 
-                # Configure camera
+                # Configure camera. BGR888 frames are already in OpenCV
+                # channel order, so no per-frame color conversion is needed
                 config = self.camera.create_still_configuration(
-                    main={"size": (width, height), "format": "RGB888"}
+                    main={"size": (width, height), "format": "BGR888"}
                 )
                 self.camera.configure(config)
                 self.camera.start()
@@ -336,7 +618,6 @@ class AdaptLightRaspi:
         if self.camera is None:
             try:
                 import cv2
-                import threading
 
                 camera_index = vision_config.get('camera_index', 0)
                 print(f"📷 Trying OpenCV camera {camera_index}...")
@@ -374,96 +655,186 @@ class AdaptLightRaspi:
             return
 
         # Start vision session
-        import threading
         session = self.vision_runtime.start_session(user_id=self.device_id)
         self._vision_session_id = session.get('session_id')
         print(f"Vision session started: {self._vision_session_id}")
 
-        # Start camera capture thread
+        # Frames are handed to a separate vision thread so capture keeps going
+        # while a (network-bound) frame is being analyzed. The queue is small
+        # and drops the oldest frame when full (see _offer_frame)
+        self._vision_queue = queue.Queue(maxsize=2)
+
+        # OpenCV can read into an existing array, so frame buffers are
+        # recycled once encoded or dropped instead of allocated per capture.
+        # picamera2's capture_array() always allocates, so it gets no pool
+        self._free_frames = None if self._use_picamera else queue.SimpleQueue()
+        self._vision_thread = threading.Thread(target=self._vision_loop, name='adaptlight-vision', daemon=True)
+        self._vision_thread.start()
+
+        # Start camera capture loop
         self._camera_running = True
-        self.camera_thread = threading.Thread(target=self._camera_loop, daemon=True)
-        self.camera_thread.start()
+        self._camera_thread = threading.Thread(target=self._camera_loop, name='adaptlight-camera', daemon=True)
+        self._camera_thread.start()
 
     def _camera_loop(self):
-        """Background thread for camera capture and vision processing."""
-        import cv2
-        import base64
-        import time
-
+        """Background thread for camera capture; frames go to _vision_loop."""
         vision_config = self.config.get('vision', {})
         interval_ms = vision_config.get('interval_ms', 2000)
         cv_interval_ms = vision_config.get('cv', {}).get('interval_ms', 200)
-        idle_check_ms = 1000  # Check for watchers every 1s when idle
 
         # Use CV interval if CV is the primary engine
         capture_interval_ms = min(interval_ms, cv_interval_ms) if vision_config.get('cv', {}).get('enabled') else interval_ms
+        capture_interval_s = capture_interval_ms / 1000.0
 
         camera_type = "picamera2" if self._use_picamera else "OpenCV"
         print(f"📹 Camera loop started ({camera_type}, interval: {capture_interval_ms}ms)")
 
+        # Everything the loop touches per frame, resolved once
+        camera = self.camera
+        use_picamera = self._use_picamera
+        get_watchers = self.vision_runtime._get_active_watchers
+        wait_for_watchers = self.vision_runtime.wait_for_watchers
+        submit = self._offer_frame
+        free_frames = self._free_frames
+        sleep = time.sleep
+        monotonic = time.monotonic
+
+        # Frames are paced against a monotonic schedule, so time spent
+        # capturing doesn't stretch the interval
+        next_deadline = monotonic() + capture_interval_s
         was_idle = False
 
-        while self._camera_running and self.camera:
+        while self._camera_running and camera:
             try:
                 # Check if there are active vision watchers before capturing
-                watchers = self.vision_runtime._get_active_watchers()
+                watchers = get_watchers()
                 if not watchers:
-                    if not was_idle and self.verbose:
-                        print(f"[Vision] No active watchers, camera idle")
+                    if not was_idle:
+                        logger.debug("[Vision] No active watchers, camera idle")
                     was_idle = True
-                    time.sleep(idle_check_ms / 1000.0)
-                    continue
+                    # Sleep until the rules or state change (or cleanup wakes us)
+                    watchers = wait_for_watchers()
+                    if not watchers or not self._camera_running:
+                        continue
 
-                if was_idle and self.verbose:
-                    print(f"[Vision] Watchers active, camera resuming: {[w.get('name') for w in watchers]}")
+                if was_idle:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("[Vision] Watchers active, camera resuming: %s", [w.get('name') for w in watchers])
+                    next_deadline = monotonic() + capture_interval_s
                 was_idle = False
 
                 # Capture frame based on camera type
-                if self._use_picamera:
-                    # picamera2 returns RGB, convert to BGR for OpenCV
-                    frame_rgb = self.camera.capture_array()
-                    if frame_rgb is None:
-                        time.sleep(0.1)
+                if use_picamera:
+                    # picamera2 is configured for BGR888, ready for OpenCV
+                    frame = camera.capture_array()
+                    if frame is None:
+                        sleep(0.1)
                         continue
-                    frame = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR)
                 else:
                     # OpenCV VideoCapture
-                    if not self.camera.isOpened():
+                    if not camera.isOpened():
                         break
-                    ret, frame = self.camera.read()
+                    try:
+                        buf = free_frames.get_nowait()
+                    except queue.Empty:
+                        buf = None
+                    ret, frame = camera.read() if buf is None else camera.read(buf)
                     if not ret or frame is None:
-                        time.sleep(0.1)
+                        if buf is not None:
+                            free_frames.put(buf)
+                        sleep(0.1)
                         continue
 
-                # Encode frame as JPEG base64 data URL
-                _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
-                base64_data = base64.b64encode(buffer).decode('utf-8')
-                image_data_url = f"data:image/jpeg;base64,{base64_data}"
+                # Hand the raw frame to the vision thread, which encodes it;
+                # capture never waits on the JPEG codec or the network
+                submit(frame)
 
-                # Process frame through vision runtime
-                if self._vision_session_id:
-                    result = self.vision_runtime.process_frame(
-                        session_id=self._vision_session_id,
-                        image_data_url=image_data_url
-                    )
+                # Sleep until the next slot. If we fell more than a whole
+                # interval behind, start over rather than bursting to catch up
+                sleep_for = next_deadline - monotonic()
+                if sleep_for > 0:
+                    sleep(sleep_for)
+                elif sleep_for < -capture_interval_s:
+                    next_deadline = monotonic()
+                next_deadline += capture_interval_s
 
-                    if self.verbose and result.get('processed'):
-                        vision_data = result.get('vision', {})
-                        print(f"[Vision] Processed: {vision_data}")
+            except Exception as e:
+                logger.debug("[Vision] Frame processing error: %s", e)
+                sleep(0.5)
 
-                    if result.get('processed') and result.get('emitted_events'):
-                        if self.verbose:
-                            print(f"[Vision] Events: {result.get('emitted_events')}")
-                        # Update LED if vision triggered a state change
-                        self._execute_state(self.smgen.get_state())
+    def _offer_frame(self, frame):
+        """Queue a frame for the vision thread, dropping the oldest if full.
 
-                # Sleep for capture interval
-                time.sleep(capture_interval_ms / 1000.0)
+        Never blocks, so a stalled vision request can't hold up capture or
+        let raw frames pile up in memory. None is the shutdown sentinel.
+        """
+        vision_queue = self._vision_queue
+        free_frames = self._free_frames
+        while True:
+            try:
+                vision_queue.put_nowait(frame)
+                return
+            except queue.Full:
+                try:
+                    dropped = vision_queue.get_nowait()
+                except queue.Empty:
+                    continue
+                if dropped is not None and free_frames is not None:
+                    free_frames.put(dropped)
+
+    def _vision_loop(self):
+        """Background thread that runs queued frames through the vision runtime.
+
+        Frames that arrive while one is being analyzed are collapsed to the
+        newest, so a slow request never leaves a backlog of stale frames, and
+        only the frame actually sent is JPEG-encoded.
+        """
+        encode, data_url_prefix = _frame_encoder(self.config.get('vision', {}))
+
+        vision_queue = self._vision_queue
+        free_frames = self._free_frames
+        b64encode = _b64encode
+
+        while True:
+            frames = [vision_queue.get()]
+            try:
+                while True:
+                    frames.append(vision_queue.get_nowait())
+            except queue.Empty:
+                pass
+            if any(frame is None for frame in frames):
+                return
+            frame = frames.pop()
+            if free_frames is not None:
+                for stale in frames:
+                    free_frames.put(stale)
+            del frames
+
+            try:
+                # Encode frame as a base64 data URL. The base64 bytes are
+                # built straight from the encoder buffer and decoded to str once
+                image_data_url = (data_url_prefix + b64encode(encode(frame))).decode('ascii')
+                # The pixels are no longer needed once encoded
+                if free_frames is not None:
+                    free_frames.put(frame)
+                frame = None
+
+                result = self.vision_runtime.process_frame(
+                    session_id=self._vision_session_id,
+                    image_data_url=image_data_url
+                )
+
+                if result.get('processed'):
+                    logger.debug("[Vision] Processed: %s", result.get('vision', {}))
+
+                if result.get('processed') and result.get('emitted_events'):
+                    logger.debug("[Vision] Events: %s", result.get('emitted_events'))
+                    # Update LED if vision triggered a state change; the
+                    # result already carries the post-transition state
+                    self._execute_state(result.get('state') or self.smgen.get_state())
 
             except Exception as e:
-                if self.verbose:
-                    print(f"[Vision] Frame processing error: {e}")
-                time.sleep(0.5)
+                logger.debug("[Vision] Frame processing error: %s", e)
 
     def _init_voice(self):
         """Initialize voice input and TTS output."""
@@ -534,7 +905,6 @@ class AdaptLightRaspi:
         except Exception as e:
             if self.verbose:
                 print(f"Mic controller initialization failed: {e}")
-            import traceback
             traceback.print_exc()
             self.mic_controller = None
 
@@ -544,22 +914,22 @@ class AdaptLightRaspi:
 
     def _on_processing_start(self, data):
         """Called when brain starts processing."""
-        if self.reactive_led:
-            self.reactive_led.start_loading_animation()
-        elif self.led:
-            self.led.start_loading_animation()
-        if self.verbose:
-            print(f"Processing: {data.get('input', '')[:50]}...")
+        led = self._loading_led
+        if led:
+            led.start_loading_animation()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Processing: %s...", data.get('input', '')[:50])
 
     def _on_processing_end(self, data):
         """Called when brain finishes processing."""
-        if self.reactive_led:
-            self.reactive_led.stop_loading_animation()
-            self.reactive_led.flash_success()
-        elif self.led:
-            self.led.stop_loading_animation()
-        if self.verbose:
-            print(f"Done in {data.get('total_ms', 0):.0f}ms")
+        led = self._loading_led
+        if led:
+            led.stop_loading_animation()
+            # Success/error flashes are only shown on the reactive strip
+            if led is self.reactive_led:
+                led.flash_success()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Done in %.0fms", data.get('total_ms', 0))
 
         # Update LED to show new state
         result = data.get('result')
@@ -568,38 +938,38 @@ class AdaptLightRaspi:
 
     def _on_tool_end(self, data):
         """Called when a tool finishes executing."""
-        if self.verbose:
-            print(f"  Tool {data.get('tool', 'unknown')}: {data.get('duration_ms', 0):.0f}ms")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("  Tool %s: %.0fms", data.get('tool', 'unknown'), data.get('duration_ms', 0))
 
     def _on_error(self, data):
         """Called on processing error."""
-        print(f"Error: {data.get('error', 'Unknown error')}")
-        if self.reactive_led:
-            self.reactive_led.stop_loading_animation()
-            self.reactive_led.flash_error()
-        elif self.led:
-            self.led.stop_loading_animation()
+        logger.error("Error: %s", data.get('error', 'Unknown error'))
+        led = self._loading_led
+        if led:
+            led.stop_loading_animation()
+            if led is self.reactive_led:
+                led.flash_error()
 
     def _on_message_ready(self, data):
         """Called when agent's done() message is ready - start TTS early."""
         message = data.get('message')
         if message and self.tts:
-            import threading
-
             # Wait for any existing TTS to finish first
-            if self.tts_thread and self.tts_thread.is_alive():
-                if self.verbose:
-                    print(f"🔊 Waiting for previous TTS to finish...")
-                self.tts_thread.join(timeout=10)
+            if self._tts_future and not self._tts_future.done():
+                logger.debug("🔊 Waiting for previous TTS to finish...")
+                wait((self._tts_future,), timeout=10)
 
-            if self.verbose:
-                print(f"🔊 Starting early TTS generation...")
-            # Start TTS generation in background thread (non-daemon so it completes)
-            self.tts_thread = threading.Thread(
-                target=self.tts.speak,
-                args=(message,)
-            )
-            self.tts_thread.start()
+            logger.debug("🔊 Starting early TTS generation...")
+            # Generate and play in the background; cleanup() waits for it
+            self._tts_future = self._pool.submit(self._speak, message)
+
+    def _speak(self, message: str):
+        """Speak a message, serialized so two replies never play at once."""
+        with self._tts_lock:
+            try:
+                self.tts.speak(message)
+            except Exception as e:
+                logger.warning("TTS failed: %s", e)
 
     # ─────────────────────────────────────────────────────────────
     # Event Handlers
@@ -607,21 +977,21 @@ class AdaptLightRaspi:
 
     def _handle_button(self, event: str):
         """Handle button events."""
-        print(f"Button event: {event}")
+        logger.info("Button event: %s", event)
         state = self.smgen.trigger(event)
         self._execute_state(state)
 
     def _handle_record_button(self):
         """Handle record button press."""
-        if self.verbose:
+        if logger.isEnabledFor(logging.DEBUG):
             mic_status = "none"
             if self.mic_controller:
                 mic_status = f"stream_open={self.mic_controller._stream_open}, recording={self.mic_controller.is_recording}"
-            print(f"Record button pressed (is_recording={self.is_recording}, mic={mic_status})")
+            logger.debug("Record button pressed (is_recording=%s, mic=%s)", self.is_recording, mic_status)
 
         # Check if we have a mic controller or voice input
         if not self.mic_controller and not self.voice:
-            print("Voice input not enabled")
+            logger.info("Voice input not enabled")
             return
 
         if self.is_recording:
@@ -645,37 +1015,30 @@ class AdaptLightRaspi:
                 transcribed_text = self.voice.stop_recording()
 
             if transcribed_text:
-                if self.verbose:
-                    print(f"Transcribed: {transcribed_text}")
-                # Reset TTS thread before processing
-                self.tts_thread = None
+                logger.debug("Transcribed: %s", transcribed_text)
+                # Reset TTS job before processing
+                self._tts_future = None
                 result = self.smgen.process(transcribed_text)
                 if result.message:
-                    if self.verbose:
-                        print(f"Response: {result.message}")
-
-                    # Wait for early TTS thread if it was started, otherwise speak now
-                    if self.tts_thread:
-                        if self.tts_thread.is_alive():
-                            if self.verbose:
-                                print("🔊 Waiting for TTS to finish...")
-                            self.tts_thread.join()
-                            if self.verbose:
-                                print("🔊 TTS thread completed")
+                    logger.debug("Response: %s", result.message)
+
+                    # Wait for early TTS job if it was started, otherwise speak now
+                    if self._tts_future:
+                        if not self._tts_future.done():
+                            logger.debug("🔊 Waiting for TTS to finish...")
+                            self._tts_future.result()
+                            logger.debug("🔊 TTS job completed")
                         else:
-                            if self.verbose:
-                                print("🔊 TTS thread already finished")
+                            logger.debug("🔊 TTS job already finished")
                     elif self.tts:
                         # Fallback: TTS wasn't started early, speak now
-                        if self.verbose:
-                            print("🔊 Fallback: speaking now...")
-                        self.tts.speak(result.message)
+                        logger.debug("🔊 Fallback: speaking now...")
+                        self._speak(result.message)
 
                 # Log to Supabase
                 self._log_command_to_supabase(transcribed_text, result)
             else:
-                if self.verbose:
-                    print("No transcription result")
+                logger.debug("No transcription result")
                 if self.reactive_led:
                     self.reactive_led.stop_loading_animation()
         else:
@@ -707,8 +1070,7 @@ class AdaptLightRaspi:
             else:
                 self.voice.start_recording(audio_callback=audio_callback)
 
-            if self.verbose:
-                print("Recording... Speak now!")
+            logger.debug("Recording... Speak now!")
 
     def _transcribe_audio(self, audio_bytes: bytes) -> str:
         """Transcribe audio bytes using Replicate Whisper."""
@@ -737,13 +1099,7 @@ class AdaptLightRaspi:
                 wav_file.writeframes(audio_bytes)
 
             try:
-                # Set Replicate API token
-                replicate_token = self.config['replicate'].get('api_token')
-                if replicate_token:
-                    os.environ['REPLICATE_API_TOKEN'] = replicate_token
-
-                if self.verbose:
-                    print(f"Transcribing {len(audio_bytes)} bytes with Replicate Whisper...")
+                logger.debug("Transcribing %d bytes with Replicate Whisper...", len(audio_bytes))
 
                 with open(tmp_path, 'rb') as audio_file:
                     output = replicate.run(
@@ -768,22 +1124,24 @@ class AdaptLightRaspi:
                 os.unlink(tmp_path)
 
         except Exception as e:
-            print(f"Transcription error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Transcription error: %s", e)
             return ""
 
     def _log_command_to_supabase(self, command: str, result):
-        """Log a processed command to Supabase."""
+        """
+        Queue a processed command for logging to Supabase.
+
+        The state machine snapshot is taken now, but the insert runs on a
+        background thread so the network round-trip stays off the voice path.
+        The session ID arrives through self._session_future.
+        """
+        from . import supabase_client
+
         try:
             # Get full state machine snapshot
             details = self.smgen.get_details()
 
-            # Reset feedback state for new command
-            self.feedback_pending = False
-            self.last_session_id = None
-
-            session_id = supabase_client.log_command_session(
+            record = supabase_client.build_session_record(
                 user_id=self.device_id,
                 command=command,
                 response_message=result.message,
@@ -798,23 +1156,71 @@ class AdaptLightRaspi:
                 run_id=result.run_id,
                 source=self.device_id
             )
-
-            if session_id:
-                self.last_session_id = session_id
-                self.feedback_pending = True
-                print(f"Logged to Supabase: {session_id} - awaiting feedback")
         except Exception as e:
-            print(f"Failed to log to Supabase: {e}")
+            logger.warning("Failed to log to Supabase: %s", e)
+            return
+
+        # Feedback now refers to this command, once its insert completes
+        future = Future()
+        self.last_session_id = None
+        self._session_future = future
+        self.feedback_pending = True
+
+        if self._supabase_thread is None:
+            self._supabase_thread = threading.Thread(
+                target=self._supabase_log_loop, name='adaptlight-supabase', daemon=True
+            )
+            self._supabase_thread.start()
+        self._supabase_queue.put((record, future))
+
+    def _supabase_log_loop(self):
+        """Insert queued command sessions, batching whatever has piled up."""
+        from . import supabase_client
+
+        log_queue = self._supabase_queue
+        while True:
+            item = log_queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stop = False
+            while len(batch) < _SUPABASE_BATCH_SIZE:
+                try:
+                    item = log_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            session_ids = supabase_client.log_command_sessions([record for record, _ in batch])
+            for (_, future), session_id in zip(batch, session_ids):
+                future.set_result(session_id)
+            if session_ids[-1]:
+                logger.info("Logged to Supabase: %s - awaiting feedback", session_ids[-1])
+            if stop:
+                return
 
     def _handle_feedback(self, worked: bool):
         """Handle feedback button press (Yes/No)."""
+        if self.feedback_pending and self.last_session_id is None and self._session_future is not None:
+            # The insert may still be in flight; wait for its session ID
+            try:
+                self.last_session_id = self._session_future.result(timeout=_SUPABASE_FEEDBACK_WAIT)
+            except Exception:
+                self.last_session_id = None
+            if not self.last_session_id:
+                self.feedback_pending = False
+
         if not self.last_session_id or not self.feedback_pending:
-            print("No pending feedback to submit")
+            logger.info("No pending feedback to submit")
             return
 
-        print(f"Feedback: {'YES' if worked else 'NO'}")
+        logger.info("Feedback: %s", 'YES' if worked else 'NO')
 
         # Submit to Supabase
+        from . import supabase_client
         success = supabase_client.submit_quick_feedback(self.last_session_id, worked)
 
         if success:
@@ -827,23 +1233,20 @@ class AdaptLightRaspi:
                 else:
                     self.reactive_led.flash_error()
 
-            print(f"Feedback submitted: {'worked' if worked else 'did not work'}")
+            logger.info("Feedback submitted: %s", 'worked' if worked else 'did not work')
         else:
-            print("Failed to submit feedback")
+            logger.warning("Failed to submit feedback")
 
     def _execute_state(self, state: dict):
         """Execute a state on the LED."""
         if not self.led:
-            print(f"Would show state: {state}")
+            logger.info("Would show state: %s", state)
             return
 
         try:
-            from .output.light_states import execute_unified_state
-            execute_unified_state(state)
+            self._execute_unified_state(state)
         except Exception as e:
-            print(f"State execution error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("State execution error: %s", e)
             # Fallback to simple color
             r = state.get('r', 0)
             g = state.get('g', 0)
@@ -855,6 +1258,28 @@ class AdaptLightRaspi:
         """Handle shutdown signals."""
         print("\nShutting down...")
         self.running = False
+        self._events.put(None)
+
+    def _post(self, handler, *args):
+        """Queue a quick handler(*args) to run on the main loop thread."""
+        self._events.put((handler, args))
+
+    def _post_command(self, handler, *args):
+        """Queue a handler(*args) that may block to run on the command thread."""
+        self._commands.put((handler, args))
+
+    def _command_loop(self):
+        """Run queued voice-command and feedback handlers one at a time."""
+        commands = self._commands
+        while True:
+            command = commands.get()
+            if command is None:
+                return
+            handler, args = command
+            try:
+                handler(*args)
+            except Exception:
+                logger.exception("Error handling %s%s", getattr(handler, '__name__', handler), args)
 
     # ─────────────────────────────────────────────────────────────
     # Main Loop
@@ -879,6 +1304,20 @@ class AdaptLightRaspi:
         print("\nReady! Press buttons or speak commands.")
         print("Press Ctrl+C to exit.\n")
 
+        # Main-button events, shutdown and periodic ticks are handled here,
+        # on one thread blocked on the event queue. Besides posted events it
+        # only wakes as often as its periodic work needs: 10 Hz for the mic
+        # controller, the API tick interval for the API runtime alone, and
+        # not at all otherwise. Voice commands and feedback run on the
+        # command thread, so they never hold up these ticks.
+        if self.mic_controller:
+            tick_interval = 0.1
+        elif self.api_runtime:
+            tick_interval = self._api_tick_interval_ms / 1000
+        else:
+            tick_interval = None
+
+        events = self._events
         try:
             while self.running:
                 # Tick API runtime if enabled
@@ -888,7 +1327,18 @@ class AdaptLightRaspi:
                 if self.mic_controller:
                     self.mic_controller.tick()
 
-                time.sleep(0.1)
+                # Wait for the next button event, shutdown or tick
+                try:
+                    event = events.get(timeout=tick_interval)
+                except queue.Empty:
+                    continue
+                if event is None:
+                    break
+                handler, args = event
+                try:
+                    handler(*args)
+                except Exception:
+                    logger.exception("Error handling %s%s", getattr(handler, '__name__', handler), args)
         except KeyboardInterrupt:
             pass
         finally:
@@ -908,23 +1358,30 @@ class AdaptLightRaspi:
         try:
             result = self.api_runtime.tick()
             if result.get('processed'):
-                if self.verbose:
-                    print(f"[API] Fetched: {result.get('fetched', [])}")
-                # If state changed, update LED
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("[API] Fetched: %s", result.get('fetched', []))
+                # If state changed, update LED with the state from the tick
                 if result.get('emitted_events'):
-                    self._execute_state(self.smgen.get_state())
+                    self._execute_state(result.get('state') or self.smgen.get_state())
         except Exception as e:
-            if self.verbose:
-                print(f"[API] Tick error: {e}")
+            logger.debug("[API] Tick error: %s", e)
 
     def cleanup(self):
         """Clean up resources."""
         print("Cleaning up...")
 
+        # No new commands; one already running is left to its daemon thread
+        self._commands.put(None)
+
         # Stop camera capture
         self._camera_running = False
-        if self.camera_thread and self.camera_thread.is_alive():
-            self.camera_thread.join(timeout=2)
+        if self._camera_thread:
+            # Wake the loop if it is idle waiting for vision watchers
+            self.smgen.state_machine.changed.set()
+            self._camera_thread.join(timeout=2)
+        if self._vision_thread:
+            self._offer_frame(None)
+            self._vision_thread.join(timeout=2)
         if self.camera:
             if self._use_picamera:
                 self.camera.stop()
@@ -949,7 +1406,20 @@ class AdaptLightRaspi:
         if self.led:
             self.led.off()
 
+        for event, callback in self._hooks.items():
+            self.smgen.off(event, callback)
+
+        # Let queued Supabase logs go out before exiting
+        if self._supabase_thread is not None:
+            self._supabase_queue.put(None)
+            self._supabase_thread.join(timeout=5)
+
+        # Drop queued jobs without waiting; a reply already being spoken
+        # still finishes before the interpreter exits
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
         print("Goodbye!")
+        _stop_logging()
 
 
 def main():
@@ -37,6 +37,45 @@ def get_client():
         return None
 
 
+def build_session_record(
+    user_id: str,
+    command: str,
+    response_message: str,
+    success: bool,
+    current_state: str,
+    current_state_data: Dict[str, Any],
+    all_states: List[Dict[str, Any]],
+    all_rules: List[Dict[str, Any]],
+    tool_calls: List[Dict[str, Any]] = None,
+    agent_steps: List[Dict[str, Any]] = None,
+    timing_ms: float = None,
+    run_id: str = None,
+    source: str = "raspi"
+) -> Dict[str, Any]:
+    """
+    Build a command_sessions row, timestamped now.
+
+    Takes the same arguments as log_command_session(), so a snapshot can be
+    taken on the caller's thread and inserted later with log_command_sessions().
+    """
+    return {
+        'user_id': user_id,
+        'command': command,
+        'response_message': response_message,
+        'success': success,
+        'current_state': current_state,
+        'current_state_data': current_state_data,
+        'all_states': all_states or [],
+        'all_rules': all_rules or [],
+        'tool_calls': tool_calls or [],
+        'agent_steps': agent_steps or [],
+        'timing_ms': timing_ms,
+        'run_id': run_id,
+        'source': source,
+        'created_at': datetime.now(timezone.utc).isoformat()
+    }
+
+
 def log_command_session(
     user_id: str,
     command: str,
@@ -73,38 +112,49 @@ def log_command_session(
     Returns:
         Session ID (UUID) or None if failed
     """
+    record = build_session_record(
+        user_id=user_id,
+        command=command,
+        response_message=response_message,
+        success=success,
+        current_state=current_state,
+        current_state_data=current_state_data,
+        all_states=all_states,
+        all_rules=all_rules,
+        tool_calls=tool_calls,
+        agent_steps=agent_steps,
+        timing_ms=timing_ms,
+        run_id=run_id,
+        source=source
+    )
+    return log_command_sessions([record])[0]
+
+
+def log_command_sessions(records: List[Dict[str, Any]]) -> List[Optional[str]]:
+    """
+    Insert several command session rows in a single request.
+
+    Args:
+        records: Rows from build_session_record()
+
+    Returns:
+        Session ID (UUID) per record, in order; all None if the insert failed
+    """
+    session_ids = [None] * len(records)
     client = get_client()
-    if not client:
-        return None
+    if not client or not records:
+        return session_ids
 
     try:
-        record = {
-            'user_id': user_id,
-            'command': command,
-            'response_message': response_message,
-            'success': success,
-            'current_state': current_state,
-            'current_state_data': current_state_data,
-            'all_states': all_states or [],
-            'all_rules': all_rules or [],
-            'tool_calls': tool_calls or [],
-            'agent_steps': agent_steps or [],
-            'timing_ms': timing_ms,
-            'run_id': run_id,
-            'source': source,
-            'created_at': datetime.now(timezone.utc).isoformat()
-        }
+        result = client.table('command_sessions').insert(records).execute()
 
-        result = client.table('command_sessions').insert(record).execute()
-
-        if result.data:
-            session_id = result.data[0].get('id')
-            print(f"Logged command session: {session_id}")
-            return session_id
-        return None
+        for i, row in enumerate((result.data or [])[:len(records)]):
+            session_ids[i] = row.get('id')
+            print(f"Logged command session: {session_ids[i]}")
+        return session_ids
     except Exception as e:
         print(f"Failed to log command session: {e}")
-        return None
+        return session_ids
 
 
 def submit_quick_feedback(
@@ -36,6 +36,15 @@ def suppress_alsa_errors():
 class VoiceReactiveLight:
     """Real-time voice-reactive lighting with smooth exponential smoothing."""
 
+    # Fixed attribute set: faster attribute access, no per-instance __dict__
+    __slots__ = (
+        'base_color', 'channels', 'chunk', 'current_brightness', 'current_rms', 'debug',
+        'format', 'led_controller', 'max_amplitude', 'min_amplitude',
+        'pyaudio_instance', 'rate', 'rng', 'running', 'selected_device',
+        'smoothing_alpha', 'start_time', 'stream', 'thread', 'update_count', '_base_rgb',
+        '_samples'
+    )
+
     def __init__(self, led_controller, color=(255, 255, 255), smoothing_alpha=0.25, debug=False):
         """
         Initialize voice-reactive light.
@@ -51,6 +60,7 @@ class VoiceReactiveLight:
         """
         self.led_controller = led_controller
         self.base_color = color
+        self._base_rgb = np.asarray(color, dtype=np.float64)
         self.smoothing_alpha = smoothing_alpha
         self.debug = debug
 
@@ -73,6 +83,9 @@ class VoiceReactiveLight:
         # Random bubble pattern state
         self.rng = np.random.default_rng()
 
+        # Reusable float32 sample buffer for RMS (grown to the largest chunk seen)
+        self._samples = np.empty(self.chunk, dtype=np.float32)
+
         # Threading
         self.running = False
         self.thread = None
@@ -126,18 +139,26 @@ class VoiceReactiveLight:
         Calculate RMS (Root Mean Square) amplitude of audio data.
 
         Args:
-            audio_data: Raw audio bytes
+            audio_data: Raw int16 audio as bytes, memoryview or int16 ndarray.
+                        Only read during the call, never retained.
 
         Returns:
             RMS amplitude value
         """
-        # Convert bytes to numpy array of int16
-        audio_array = np.frombuffer(audio_data, dtype=np.int16)
+        # View the caller's buffer as int16 samples (no copy)
+        pcm = np.frombuffer(audio_data, dtype=np.int16)
+        n = pcm.size
+        if not n:
+            return 0.0
 
-        # Calculate RMS
-        rms = np.sqrt(np.mean(np.square(audio_array.astype(np.float32))))
+        # Widen into the reusable float32 buffer instead of a fresh array
+        if self._samples.size < n:
+            self._samples = np.empty(n, dtype=np.float32)
+        samples = self._samples[:n]
+        np.copyto(samples, pcm)
 
-        return rms
+        # Sum of squares as a single dot product (no squared temporary)
+        return float(np.sqrt(np.dot(samples, samples) / samples.size))
 
     def smooth_value(self, new_value, current_value):
         """
@@ -196,21 +217,21 @@ class VoiceReactiveLight:
         lit_ratio = brightness / 255.0
         num_lit = int(led_count * lit_ratio)
 
-        # Generate random brightness for each pixel
-        # Each pixel has a chance to be "on" based on the lit_ratio
-        for i in range(led_count):
-            if self.rng.random() < lit_ratio:
-                # Random brightness between 50% and 100% for lit pixels
-                pixel_brightness = 0.5 + 0.5 * self.rng.random()
+        # Generate random brightness for each pixel in one vectorized pass.
+        # Each pixel has a chance to be "on" based on the lit_ratio, with a
+        # random brightness between 50% and 100% when lit
+        rnd = self.rng.random((led_count, 2))
+        scale = np.where(rnd[:, 0] < lit_ratio, 0.5 + 0.5 * rnd[:, 1], 0.0)
 
-                r = int(self.base_color[0] * pixel_brightness)
-                g = int(self.base_color[1] * pixel_brightness)
-                b = int(self.base_color[2] * pixel_brightness)
+        render = getattr(self.led_controller, 'render', None)
+        if render is not None and getattr(self.led_controller, 'pixels', None):
+            # Scale, truncate and write the whole strip in one pass
+            render(scale, self._base_rgb)
+            return
 
-                self.led_controller.set_pixel(i, r, g, b)
-            else:
-                # Pixel is off
-                self.led_controller.set_pixel(i, 0, 0, 0)
+        frame = (scale[:, None] * self._base_rgb).astype(np.uint8)
+        for i, (r, g, b) in enumerate(frame.tolist()):
+            self.led_controller.set_pixel(i, r, g, b)
 
         # Show the updated pixels
         self.led_controller.show()
@@ -264,8 +285,12 @@ class VoiceReactiveLight:
         """
         Process audio data and update LEDs (for use with external audio source).
 
+        Called on the audio thread for every chunk. The samples are read in
+        place and not copied, so audio_data may be a view into the capture
+        buffer; it is not retained after this returns.
+
         Args:
-            audio_data: Raw audio bytes from external source
+            audio_data: Raw int16 audio (bytes, memoryview or ndarray view)
         """
         if not self.running:
             return
@@ -344,6 +369,7 @@ class VoiceReactiveLight:
             color: RGB tuple (e.g., (255, 0, 0) for red)
         """
         self.base_color = color
+        self._base_rgb = np.asarray(color, dtype=np.float64)
 
     def set_smoothing(self, alpha):
         """
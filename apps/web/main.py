@@ -32,13 +32,20 @@ from brain.processing.audio_runtime import AudioRuntime
 from brain.processing.volume_runtime import VolumeRuntime
 from brain.apis.api_executor import APIExecutor
 
+# Prefer the libyaml C bindings when PyYAML was built with them
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+
 def load_config(config_path: str = None) -> dict:
     """Load configuration from YAML file."""
     if config_path is None:
         config_path = Path(__file__).parent / 'config.yaml'
 
     with open(config_path) as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=_YamlLoader)
 
     # Expand environment variables
     def expand_env(obj):
@@ -203,10 +203,17 @@ class State:
 class States:
     """Manages a collection of states."""
 
-    def __init__(self):
-        """Initialize empty state collection."""
+    def __init__(self, changed=None):
+        """
+        Initialize empty state collection.
+
+        Args:
+            changed: Optional threading.Event set whenever the collection changes
+        """
         self.states = []
         self._on_enter_callback = None
+        self._changed = changed
+        self.version = 0  # Bumped whenever a state is added, replaced or removed
 
     def set_on_enter_callback(self, callback):
         """
@@ -238,13 +245,21 @@ class States:
             if existing_state.name == state.name:
                 # Replace/overwrite the existing state
                 self.states[i] = state
+                self._mark_changed()
                 print(f"State replaced: {state.name}")
                 return
 
         # State doesn't exist, add it
         self.states.append(state)
+        self._mark_changed()
         print(f"State added to collection: {state.name}")
 
+    def _mark_changed(self):
+        """Bump the version and set the `changed` event, if any."""
+        self.version += 1
+        if self._changed is not None:
+            self._changed.set()
+
     def get_states(self):
         """Get all states as a list."""
         return self.states
@@ -274,6 +289,7 @@ class States:
         for i, state in enumerate(self.states):
             if state.name == name:
                 deleted = self.states.pop(i)
+                self._mark_changed()
                 print(f"State deleted: {deleted.name}")
                 return True
         print(f"State not found: {name}")
@@ -282,6 +298,7 @@ class States:
     def clear_states(self):
         """Clear all states."""
         self.states = []
+        self._mark_changed()
         print("All states cleared")
 
     def get_states_for_prompt(self):
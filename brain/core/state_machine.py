@@ -33,7 +33,10 @@ class StateMachine:
         self.rules: List[Rule] = []
         self.current_state = 'off'
         self.current_state_params = None
-        self.states = States()
+        # Set on every version bump, so threads can sleep until the rules or
+        # the current state change instead of polling
+        self.changed = threading.Event()
+        self.states = States(changed=self.changed)
         self.state_data = {}
         self.interval = None
         self.interval_callback = None
@@ -41,6 +44,7 @@ class StateMachine:
         self.rule_id_counter = 0  # Unique ID for each rule
         self.pipeline_executor = None  # Set by tool_registry to enable pipeline execution
         self.debug = debug  # Enable debug output (FPS timing)
+        self.version = 0  # Bumped whenever rules or the current state change
 
         # State rendering
         self.representation_version = representation_version
@@ -172,11 +176,17 @@ class StateMachine:
         else:
             self.rules.append(rule_obj)
             print(f"Rule added: {rule_obj}")
+        self._mark_changed()
 
         # Schedule timer if this is a time-based rule
         if rule_obj.transition in ['timer', 'interval', 'schedule']:
             self._schedule_rule(rule_obj)
 
+    def _mark_changed(self):
+        """Bump the version and wake anything waiting on `changed`."""
+        self.version += 1
+        self.changed.set()
+
     def get_rules(self) -> List[Rule]:
         """Get all rules."""
         return self.rules
@@ -189,12 +199,14 @@ class StateMachine:
         self.active_timers = {}
 
         self.rules = []
+        self._mark_changed()
         print("All rules cleared and timers cancelled")
 
     def remove_rule(self, index: int):
         """Remove a specific rule by index."""
         if 0 <= index < len(self.rules):
             removed = self.rules.pop(index)
+            self._mark_changed()
             # Cancel any active timer for this rule
             if hasattr(removed, 'id'):
                 self._cancel_timer(removed.id)
@@ -249,6 +261,7 @@ class StateMachine:
             # Auto-cleanup if configured
             if auto_cleanup and rule in self.rules:
                 self.rules.remove(rule)
+                self._mark_changed()
                 print(f"Rule auto-removed")
 
             # Remove from active timers
@@ -366,6 +379,7 @@ class StateMachine:
                 # One-time schedule, remove rule and timer
                 if rule in self.rules:
                     self.rules.remove(rule)
+                    self._mark_changed()
                     print(f"One-time schedule completed, rule removed")
                 if rule.id in self.active_timers:
                     del self.active_timers[rule.id]
@@ -440,6 +454,7 @@ class StateMachine:
 
         self.current_state = state_name
         self.current_state_params = params
+        self._mark_changed()
         print(f"State changed to: {state_name}")
 
         # Execute the onEnter function for this state if it exists
@@ -718,6 +733,7 @@ class StateMachine:
         self.current_state = 'off'
         self.current_state_params = None
         self.state_data = {}
+        self._mark_changed()
 
         # Cancel all timers
         for rule_id, timer in list(self.active_timers.items()):
@@ -727,7 +743,7 @@ class StateMachine:
         if restore_defaults:
             # Clear existing rules and states
             self.rules = []
-            self.states = States()
+            self.states = States(changed=self.changed)
             self.rule_id_counter = 0
             # Re-add default rules
             self._setup_default_rules()
@@ -6,16 +6,31 @@ Contains agent executor and command parser for processing user input.
 
 from .agent import AgentExecutor
 from .parser import CommandParser
-from .vision_runtime import VisionRuntime
-from .api_runtime import APIRuntime
-from .audio_runtime import AudioRuntime
-from .volume_runtime import VolumeRuntime
 from .vision_shared import (
     normalize_engine,
     looks_cv_friendly,
     cv_supported_fields,
 )
 
+# Reactive runtimes are optional per deployment, so they are only imported
+# when first accessed (e.g. `from brain.processing import VisionRuntime`)
+_LAZY_RUNTIMES = {
+    'VisionRuntime': '.vision_runtime',
+    'APIRuntime': '.api_runtime',
+    'AudioRuntime': '.audio_runtime',
+    'VolumeRuntime': '.volume_runtime',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_RUNTIMES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 __all__ = [
     'AgentExecutor',
     'CommandParser',
@@ -558,6 +558,28 @@ class VisionRuntime:
 
         return watchers  # No deduplication needed with simplified model
 
+    def wait_for_watchers(self, timeout: float = None) -> list:
+        """
+        Block until a vision watcher is active, without polling.
+
+        Watchers only change when the rules, states or current state do, so
+        this sleeps on the state machine's `changed` event between checks.
+        Meant for a single waiting thread (e.g. an idle camera loop); setting
+        `state_machine.changed` from outside wakes it early.
+
+        Args:
+            timeout: Seconds to wait before giving up (None waits indefinitely)
+
+        Returns:
+            Active watchers, or [] if woken or timed out with none active
+        """
+        changed = self.state_machine.changed
+        changed.clear()
+        watchers = self._get_active_watchers()
+        if watchers or not changed.wait(timeout):
+            return watchers
+        return self._get_active_watchers()
+
     @staticmethod
     def _state_match(rule_state: str, current_state: str) -> bool:
         if rule_state == '*':
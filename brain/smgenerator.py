@@ -91,6 +91,7 @@ class SMgenerator:
         self.config = config
         self.hooks: Dict[str, List[Callable]] = {}
         self._last_tool_calls: List[Dict] = []
+        self._details_cache = None  # (version key, get_details() result)
 
         # Get representation version
         self.representation_version = config.get('representation_version', 'stdlib')
@@ -178,6 +179,17 @@ class SMgenerator:
         """
         self.hooks.setdefault(event, []).append(callback)
 
+    def on_many(self, callbacks: Dict[str, Callable]) -> None:
+        """
+        Register several callbacks at once.
+
+        Args:
+            callbacks: Mapping of event name to callback (see on() for events)
+        """
+        hooks = self.hooks
+        for event, callback in callbacks.items():
+            hooks.setdefault(event, []).append(callback)
+
     def off(self, event: str, callback: Callable) -> None:
         """Unregister a callback."""
         if event in self.hooks and callback in self.hooks[event]:
@@ -407,7 +419,20 @@ class SMgenerator:
         }
 
     def get_details(self) -> Dict[str, Any]:
-        """Get detailed state machine info including all states and rules."""
+        """
+        Get detailed state machine info including all states and rules.
+
+        The result is cached until the state machine's rules, states or
+        current state change, so treat it as read-only.
+        """
+        sm = self.state_machine
+        key = (sm.version, id(sm.states), sm.states.version)
+        if self._details_cache is None or self._details_cache[0] != key:
+            self._details_cache = (key, self._build_details())
+        return self._details_cache[1]
+
+    def _build_details(self) -> Dict[str, Any]:
+        """Snapshot all states and rules for get_details()."""
         # Built-in default states
         states = [
             {
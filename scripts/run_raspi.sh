@@ -21,6 +21,8 @@ fi
 if [ -f ".env" ]; then
     export $(grep -v '^#' .env | xargs)
 fi
+# Already exported above, so the app doesn't parse .env again
+export ADAPTLIGHT_ENV_LOADED=1
 
 # Ensure brain is importable
 export PYTHONPATH="/home/lamp/adaptlight:$PYTHONPATH"